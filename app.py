@@ -5,6 +5,7 @@ Premium UI with themes, accessibility, responsive design, drive mode & offline s
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import folium
 from folium import plugins
 from streamlit_folium import st_folium
@@ -12,7 +13,10 @@ import time
 import json
 import base64
 from datetime import datetime
-from dijkstra import load_cities, build_graph, dijkstra, calculate_distance_km
+from collections import ChainMap
+from dijkstra import bounded_search, calculate_distance_km, haversine_km
+from routing_engine import LOCAL_ROUTE_KM, SNAP_CANDIDATES
+from country_shards import ShardRegistry, SHARD_DIRECTORY
 from locations_data import get_all_locations, get_location_categories
 
 
@@ -2147,66 +2151,140 @@ def get_nearby_places(location, category):
 
 
 # ==================== HELPER FUNCTIONS ====================
-@st.cache_data
-def load_data():
-    return load_cities("pak_cities.csv")
+# Search between cities: None reads routes from the engine's shared
+# shortest-path trees; one of dijkstra.ROUTING_ALGORITHMS (e.g. "astar")
+# runs that search for every route instead
+ROUTING_ALGORITHM = None
 
+# Range slider bounds and step; the graph is built once at the largest range
+MIN_RANGE_KM = 100
+MAX_RANGE_KM = 500
+RANGE_STEP_KM = 25
 
-@st.cache_data
-def load_all_locations():
-    cities = load_cities("pak_cities.csv")
-    all_locations = {city["name"]: {"lat": city["lat"], "lon": city["lon"], "type": "city"} for city in cities}
-    for name, coords in get_all_locations().items():
-        if name not in all_locations:
-            all_locations[name] = {"lat": coords[0], "lon": coords[1], "type": "area"}
-    return all_locations
+# Average road winding factor: roads are typically 1.3-1.5x longer than the
+# straight line
+ROAD_FACTOR = 1.4
 
+# Isochrone bands as (fraction of the time budget, colour)
+ISOCHRONE_BANDS = ((0.25, "#22c55e"), (0.5, "#84cc16"), (0.75, "#f59e0b"), (1.0, "#ef4444"))
 
-@st.cache_data
-def build_city_graph(threshold):
-    return build_graph(load_data(), threshold_km=threshold)
 
+# Country shown first; its curated areas from locations_data are added to
+# its cities, and it is the only one served when no shards have been built
+HOME_COUNTRY = "Pakistan"
 
-def find_nearest_city(loc_coords, cities):
-    min_dist, nearest = float('inf'), None
-    for city in cities:
-        dist = calculate_distance_km(loc_coords["lat"], loc_coords["lon"], city["lat"], city["lon"])
-        if dist < min_dist:
-            min_dist, nearest = dist, city["name"]
-    return nearest, min_dist
+# Memory budget for loaded country engines; the least recently used
+# countries are unloaded once it is exceeded
+SHARD_MEMORY_BYTES = 512 * 1024 * 1024
 
 
-def find_route(source, dest, all_locations, cities, graph):
-    src_coords, dst_coords = all_locations[source], all_locations[dest]
-    direct = calculate_distance_km(src_coords["lat"], src_coords["lon"], dst_coords["lat"], dst_coords["lon"])
-    
-    if direct < 50:
-        return [source, dest], round(direct, 2), "local"
-    
-    src_city, src_dist = find_nearest_city(src_coords, cities)
-    dst_city, dst_dist = find_nearest_city(dst_coords, cities)
+@st.cache_resource
+def get_shards():
+    # One registry per process, shared by reference with every session and
+    # rerun (st.cache_data would unpickle a fresh copy each time). Countries
+    # are loaded on first use from the shards built by country_shards.py;
+    # without them the app serves pak_cities.csv alone
+    extra_locations = {HOME_COUNTRY: get_all_locations()}
+    try:
+        return ShardRegistry.from_manifest(SHARD_DIRECTORY, MAX_RANGE_KM, max_bytes=SHARD_MEMORY_BYTES,
+                                           extra_locations=extra_locations)
+    except FileNotFoundError:
+        return ShardRegistry({HOME_COUNTRY: "pak_cities.csv"}, MAX_RANGE_KM, SHARD_MEMORY_BYTES, extra_locations)
+
+
+def get_engine(country=HOME_COUNTRY):
+    # Read-only engine shared by every session; its graph is built once at
+    # the widest range with each city's edges sorted by distance
+    return get_shards().engine(country)
+
+
+def build_city_graph(engine, threshold):
+    # Zero-copy view of the shared graph; moving the slider never recomputes
+    # distances or caches another copy of the edges
+    return engine.graph_for(threshold)
+
+
+def load_distance_table(country, threshold):
+    # Memory-mapped once per process and charged to the country's memory
+    # budget. Tables are prebuilt by distance_table.py (or
+    # country_shards.py --tables)
+    return get_shards().distance_table(country, threshold)
+
+
+def reset_country_state():
+    # Routes, pins and selections belong to the previous country's places
+    for key in ("current_route", "from_pin_coords", "to_pin_coords", "src", "dst", "drive_step"):
+        st.session_state.pop(key, None)
+    st.session_state.custom_locations = {}
+
+
+def segment_distances_km(path, all_locations):
+    """Straight-line distance of every consecutive leg of a path, in one batch."""
+    lats = np.array([all_locations[loc]["lat"] for loc in path], dtype=float)
+    lons = np.array([all_locations[loc]["lon"] for loc in path], dtype=float)
+    return haversine_km(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+
+def find_route(source, dest, all_locations, engine, graph, algorithm=ROUTING_ALGORITHM, table=None):
+    # Routes between shared places are the same for every session, so they
+    # go through the engine's cross-session cache (B→A is served from A→B);
+    # session-specific custom locations are always computed
+    shared = all(all_locations[name] is engine.locations.get(name) for name in (source, dest))
+    if shared:
+        cached = engine.routes.get(source, dest, graph.threshold_km)
+        if cached is not None:
+            return cached
+    result = compute_route(source, dest, all_locations, engine, graph, algorithm, table)
+    if shared:
+        engine.routes.put(source, dest, graph.threshold_km, result)
+    return result
+
+
+def compute_route(source, dest, all_locations, engine, graph, algorithm=ROUTING_ALGORITHM, table=None):
+    return engine.route(source, dest, graph.threshold_km, all_locations, algorithm, table, SNAP_CANDIDATES)
+
+
+def custom_location(lat, lon, engine):
+    """Location entry for a dropped pin or live position, snapped to its
+    nearest city once here so later routes don't look it up again."""
+    city, city_km = engine.nearest_city(lat, lon)
+    return {"lat": lat, "lon": lon, "type": "custom", "nearest_city": city, "nearest_km": city_km}
+
+
+def nearby_cities_note(lat, lon, engine, k=3):
+    """One-line summary of the k cities closest to a pin."""
+    nearby = " • ".join(f"{name} ({km:.0f} km)" for name, km in engine.nearest_cities(lat, lon, k))
+    return f'<p style="text-align:center;color:var(--text-muted);">🏙️ Nearest cities: {nearby}</p>'
+
+
+def find_reachable(source, all_locations, engine, graph, max_km):
+    """Every shared place within max_km of the source, using find_route's
+    distance rules, from one bounded search seeded at the source's
+    SNAP_CANDIDATES nearest cities. Returns {name: km}."""
+    src_coords = all_locations[source]
+    lats, lons = engine.location_coords
+    direct = haversine_km(src_coords["lat"], src_coords["lon"], lats, lons)
+    totals = np.full(len(engine.location_names), np.inf)
     
-    if src_city == dst_city:
-        return [source, dest], round(direct, 2), "local"
+    src_city, _ = engine.snap(source, all_locations)
+    seeds = {city: km for city, km in engine.snap_candidates(source, all_locations, SNAP_CANDIDATES)
+             if km <= max_km}
+    if seeds:
+        reached = bounded_search(graph, seeds, max_km)
+        city_km = np.array([reached.get(name, np.inf) for name in engine.names])
+        # Each place ends at the best of its own candidate cities
+        totals = (city_km[engine.location_candidates] + engine.location_candidates_km).min(axis=1)
+        # Places sharing the source's nearest city are routed directly
+        same_city = np.asarray(engine.names, dtype=object)[engine.location_nearest_city] == src_city
+        totals = np.where(same_city, direct, totals)
+    totals = np.where(direct < LOCAL_ROUTE_KM, direct, totals)
     
-    try:
-        city_path, city_dist = dijkstra(graph, src_city, dst_city)
-        if city_path:
-            path = [source] + ([src_city] if source != src_city else [])
-            path += city_path[1:-1]
-            path += ([dst_city] if dest != dst_city else []) + [dest]
-            seen, unique = set(), []
-            for p in path:
-                if p not in seen:
-                    seen.add(p)
-                    unique.append(p)
-            return unique, round(src_dist + city_dist + dst_dist, 2), "intercity"
-    except:
-        pass
-    return [source, dest], round(direct, 2), "direct"
-
-
-def create_map(path, locations, mode="car"):
+    return {engine.location_names[i]: float(totals[i])
+            for i in np.flatnonzero(totals <= max_km).tolist()
+            if engine.location_names[i] != source}
+
+
+def create_map(path, locations, mode="car", reachable=None, budget_km=None, speed=None):
     coords = [(locations[loc]["lat"], locations[loc]["lon"]) for loc in path]
     center = [sum(c[0] for c in coords)/len(coords), sum(c[1] for c in coords)/len(coords)]
     
@@ -2215,6 +2293,20 @@ def create_map(path, locations, mode="car"):
     colors = {"car": "#22c55e", "bike": "#f59e0b", "cycle": "#3b82f6", "walk": "#8b5cf6"}
     color = colors.get(mode, "#22c55e")
     
+    if reachable:
+        # Isochrone layer: reachable places coloured by share of the budget
+        budget = budget_km or max(reachable.values()) or 1
+        layer = folium.FeatureGroup(name="⏱️ Reachable")
+        for name, km in reachable.items():
+            band_color = next(c for limit, c in ISOCHRONE_BANDS if km <= budget * limit)
+            road_km = get_road_distance(km)
+            folium.CircleMarker(
+                [locations[name]["lat"], locations[name]["lon"]], radius=4, weight=0,
+                fill=True, fill_color=band_color, fill_opacity=0.7,
+                tooltip=f"{name}: ~{road_km:.0f} km" + (f" • {est_time(road_km, speed)}" if speed else "")
+            ).add_to(layer)
+        layer.add_to(m)
+    
     folium.PolyLine(coords, weight=5, color=color, opacity=0.8).add_to(m)
     plugins.AntPath(coords, delay=1000, weight=3, color=color, pulse_color='#fff', dash_array=[10,20]).add_to(m)
     
@@ -2228,6 +2320,8 @@ def create_map(path, locations, mode="car"):
             ic = folium.Icon(color='blue', icon='circle', prefix='fa')
         folium.Marker([lat, lon], tooltip=loc, icon=ic).add_to(m)
     
+    if reachable:
+        folium.LayerControl().add_to(m)
     m.fit_bounds(coords)
     return m
 
@@ -2259,7 +2353,6 @@ def create_pin_map(center_lat=30.3753, center_lon=69.3451, existing_pin=None, pi
 def get_road_distance(straight_dist):
     """Convert straight-line distance to approximate road distance.
     Roads are typically 1.3-1.5x longer than straight line distance."""
-    ROAD_FACTOR = 1.4  # Average road winding factor
     return round(straight_dist * ROAD_FACTOR, 1)
 
 
@@ -2297,6 +2390,7 @@ def generate_offline_data(path, distance, all_locations, mode_key, fuel_avg, fue
     }
     
     cumulative = 0
+    segments = segment_distances_km(path, all_locations)
     for i, loc in enumerate(path):
         coords = all_locations[loc]
         route_data["coordinates"].append({
@@ -2308,10 +2402,7 @@ def generate_offline_data(path, distance, all_locations, mode_key, fuel_avg, fue
         
         if i < len(path) - 1:
             next_loc = path[i + 1]
-            next_coords = all_locations[next_loc]
-            seg_straight = calculate_distance_km(coords["lat"], coords["lon"], 
-                                                next_coords["lat"], next_coords["lon"])
-            seg_dist = get_road_distance(seg_straight)
+            seg_dist = get_road_distance(float(segments[i]))
             cumulative += seg_dist
             
             route_data["directions"].append({
@@ -2439,12 +2530,16 @@ def main():
     
     # Load data first
     try:
-        cities = load_data()
-        all_locations = load_all_locations()
-        # Add custom locations to all_locations
-        all_locations.update(st.session_state.custom_locations)
+        countries = get_shards().countries()
+        if st.session_state.get('country') not in countries:
+            st.session_state.country = HOME_COUNTRY if HOME_COUNTRY in countries else countries[0]
+        country = st.session_state.country
+        engine = get_engine(country)
+        # Custom locations sit on top of the shared read-only table; new
+        # entries land in the session's own custom_locations dict
+        all_locations = ChainMap(st.session_state.custom_locations, engine.locations)
         location_names = sorted(all_locations.keys())
-        location_categories = get_location_categories()
+        location_categories = get_location_categories() if country == HOME_COUNTRY else {}
     except FileNotFoundError:
         st.error("⚠️ Run `python data_preparation.py` first!")
         st.stop()
@@ -2466,6 +2561,13 @@ def main():
         
         st.markdown("---")
         
+        # Country selector; each country's data is loaded on first use
+        if len(countries) > 1:
+            st.markdown("**🌍 Country**")
+            st.selectbox("Country", countries, key="country", on_change=reset_country_state,
+                         label_visibility="collapsed")
+            st.markdown("---")
+        
         # Location browser
         st.markdown("**📍 Location Browser**")
         for cat, locs in location_categories.items():
@@ -2527,12 +2629,14 @@ def main():
             
             pin_map_from = create_pin_map(center[0], center[1], from_pin_coords, "from")
             map_data_from = st_folium(pin_map_from, width=None, height=300, returned_objects=["last_clicked"])
+            if from_pin_coords:
+                st.markdown(nearby_cities_note(from_pin_coords["lat"], from_pin_coords["lon"], engine), unsafe_allow_html=True)
             
             if map_data_from.get("last_clicked"):
                 lat = map_data_from["last_clicked"]["lat"]
                 lon = map_data_from["last_clicked"]["lng"]
                 custom_name = f"Custom From ({lat:.4f}, {lon:.4f})"
-                st.session_state.custom_locations[custom_name] = {"lat": lat, "lon": lon, "type": "custom"}
+                st.session_state.custom_locations[custom_name] = custom_location(lat, lon, engine)
                 st.session_state.from_pin_coords = {"lat": lat, "lon": lon, "name": custom_name}
                 source = custom_name
                 st.session_state.show_from_pin_map = False
@@ -2576,12 +2680,14 @@ def main():
             
             pin_map_to = create_pin_map(center[0], center[1], to_pin_coords, "to")
             map_data_to = st_folium(pin_map_to, width=None, height=300, returned_objects=["last_clicked"])
+            if to_pin_coords:
+                st.markdown(nearby_cities_note(to_pin_coords["lat"], to_pin_coords["lon"], engine), unsafe_allow_html=True)
             
             if map_data_to.get("last_clicked"):
                 lat = map_data_to["last_clicked"]["lat"]
                 lon = map_data_to["last_clicked"]["lng"]
                 custom_name = f"Custom To ({lat:.4f}, {lon:.4f})"
-                st.session_state.custom_locations[custom_name] = {"lat": lat, "lon": lon, "type": "custom"}
+                st.session_state.custom_locations[custom_name] = custom_location(lat, lon, engine)
                 st.session_state.to_pin_coords = {"lat": lat, "lon": lon, "name": custom_name}
                 dest = custom_name
                 st.session_state.show_to_pin_map = False
@@ -2739,11 +2845,7 @@ def main():
         try:
             data = json.loads(from_live_data)
             custom_name = f"My Location (From) - {data['lat']:.4f}, {data['lon']:.4f}"
-            st.session_state.custom_locations[custom_name] = {
-                "lat": data['lat'],
-                "lon": data['lon'],
-                "type": "custom"
-            }
+            st.session_state.custom_locations[custom_name] = custom_location(data['lat'], data['lon'], engine)
             all_locations[custom_name] = st.session_state.custom_locations[custom_name]
             location_names = sorted(all_locations.keys())
             source = custom_name
@@ -2756,11 +2858,7 @@ def main():
         try:
             data = json.loads(to_live_data)
             custom_name = f"My Location (To) - {data['lat']:.4f}, {data['lon']:.4f}"
-            st.session_state.custom_locations[custom_name] = {
-                "lat": data['lat'],
-                "lon": data['lon'],
-                "type": "custom"
-            }
+            st.session_state.custom_locations[custom_name] = custom_location(data['lat'], data['lon'], engine)
             all_locations[custom_name] = st.session_state.custom_locations[custom_name]
             location_names = sorted(all_locations.keys())
             dest = custom_name
@@ -2881,7 +2979,12 @@ def main():
             label_visibility="collapsed"
         )
     with c3:
-        threshold = st.slider("🔗 Range (km)", 100, 500, 300, 25)
+        full_range = engine.connecting_threshold_km
+        threshold = st.slider("🔗 Range (km)", MIN_RANGE_KM, MAX_RANGE_KM, 300, RANGE_STEP_KM,
+                              help=(f"Every city is connected from {full_range:.0f} km" if full_range
+                                    else "Some places stay unconnected at every range"))
+        auto_range = st.checkbox("🎯 Auto range", key="auto_range",
+                                 help="Use the smallest range that still connects the two places")
     
     # Settings Row 2
     c4, c5 = st.columns(2)
@@ -2897,7 +3000,7 @@ def main():
             all_locations[dest]["lat"], all_locations[dest]["lon"]
         )
         direct_road = get_road_distance(direct_straight)
-        route_type = "🏙️ Local" if direct_straight < 50 else "🛣️ Inter-City"
+        route_type = "🏙️ Local" if direct_straight < LOCAL_ROUTE_KM else "🛣️ Inter-City"
         st.markdown(f'<p style="text-align:center;color:var(--text-muted);">📏 Est. Road Distance: <strong style="color:var(--accent);">~{direct_road:.0f} km</strong> • {route_type}</p>', unsafe_allow_html=True)
     
     # Find Route Button
@@ -2907,9 +3010,22 @@ def main():
         else:
             progress = st.progress(0)
             progress.progress(30)
-            graph = build_city_graph(threshold)
+            if auto_range:
+                # Sparsest graph that still connects them: fewest edges to search
+                threshold = engine.connecting_threshold(
+                    source, dest, range(MIN_RANGE_KM, MAX_RANGE_KM + 1, RANGE_STEP_KM), all_locations,
+                    SNAP_CANDIDATES) or threshold
+            graph = build_city_graph(engine, threshold)
             progress.progress(60)
-            path, straight_distance, route_mode = find_route(source, dest, all_locations, cities, graph)
+            table = load_distance_table(country, threshold)
+            path, straight_distance, route_mode = find_route(source, dest, all_locations, engine, graph, table=table)
+            connect_at = None
+            if route_mode == "direct":
+                # The cities lie in different components; find the range
+                # that would join them (component labels make this cheap)
+                connect_at = engine.connecting_threshold(
+                    source, dest, range(threshold, MAX_RANGE_KM + 1, RANGE_STEP_KM), all_locations,
+                    SNAP_CANDIDATES)
             # Apply road factor for realistic distance
             distance = get_road_distance(straight_distance)
             progress.progress(100)
@@ -2923,6 +3039,9 @@ def main():
                     "distance": distance,
                     "straight_distance": straight_distance,
                     "route_mode": route_mode,
+                    "connect_at": connect_at,
+                    "threshold": threshold,
+                    "auto_range": auto_range,
                     "source": source,
                     "dest": dest,
                     "mode_key": mode_key,
@@ -2942,6 +3061,15 @@ def main():
         fuel_avg = route_data["fuel_avg"]
         fuel_price = route_data["fuel_price"]
         
+        if route_mode == "direct":
+            connect_at = route_data.get("connect_at")
+            hint = (f"Set 🔗 Range to at least {connect_at} km to connect them."
+                    if connect_at else f"No range up to {MAX_RANGE_KM} km connects them.")
+            st.warning(f"⚠️ No road connection within a {route_data.get('threshold')} km range, "
+                       f"so the straight line is shown. {hint}")
+        elif route_data.get("auto_range"):
+            st.markdown(f'<p style="text-align:center;color:var(--text-muted);">🎯 Auto range: {route_data["threshold"]} km</p>', unsafe_allow_html=True)
+        
         if path:
             # Live badge
             st.markdown('<div class="live-badge"><div class="live-dot"></div><span class="live-text">Route Found</span></div>', unsafe_allow_html=True)
@@ -3011,8 +3139,18 @@ def main():
             tabs = st.tabs(["🗺️ MAP", "🚗 DRIVE", "📍 DIRECTIONS", "💾 OFFLINE", "🍽️ FOOD", "🏨 STAY", "☕ CAFÉS", "🌳 PARKS"])
             
             with tabs[0]:  # MAP
+                reachable = budget_km = None
+                if st.checkbox("⏱️ Show places reachable from the start", key="show_isochrone"):
+                    hours = st.slider("Within (hours)", 0.5, 12.0, 2.0, 0.5, key="isochrone_hours")
+                    # Budget in straight-line km, matching how route distances are measured
+                    budget_km = hours * selected_speed / ROAD_FACTOR
+                    # Same graph the route was found on, even if the slider or
+                    # 🎯 Auto range picked another threshold since
+                    reachable = find_reachable(route_data["source"], all_locations, engine,
+                                               build_city_graph(engine, route_data["threshold"]), budget_km)
+                    st.markdown(f'<p style="text-align:center;color:var(--text-muted);">{len(reachable)} places within {hours:g} h at {selected_speed} km/h • colour runs from green (quick) to red (at the limit)</p>', unsafe_allow_html=True)
                 st.markdown('<div id="map" class="map-container">', unsafe_allow_html=True)
-                st_folium(create_map(path, all_locations, mode_key), width=None, height=450, returned_objects=[])
+                st_folium(create_map(path, all_locations, mode_key, reachable, budget_km, selected_speed), width=None, height=450, returned_objects=[])
                 st.markdown('</div>', unsafe_allow_html=True)
                 st.markdown('<p style="text-align:center;color:var(--text-muted);margin-top:0.5rem;">🟢 Start • 🔵 Stop • 🔴 End</p>', unsafe_allow_html=True)
             
@@ -3028,20 +3166,12 @@ def main():
                     current_loc = path[current_step]
                     next_loc = path[current_step + 1]
                     
-                    seg_dist_straight = calculate_distance_km(
-                        all_locations[current_loc]["lat"], all_locations[current_loc]["lon"],
-                        all_locations[next_loc]["lat"], all_locations[next_loc]["lon"]
-                    )
-                    seg_dist = get_road_distance(seg_dist_straight)
+                    # Measure all remaining legs in one batch
+                    remaining_legs = segment_distances_km(path[current_step:], all_locations)
+                    seg_dist = get_road_distance(float(remaining_legs[0]))
                     
                     # Calculate remaining distance
-                    remaining_straight = 0
-                    for i in range(current_step, len(path) - 1):
-                        remaining_straight += calculate_distance_km(
-                            all_locations[path[i]]["lat"], all_locations[path[i]]["lon"],
-                            all_locations[path[i+1]]["lat"], all_locations[path[i+1]]["lon"]
-                        )
-                    remaining = get_road_distance(remaining_straight)
+                    remaining = get_road_distance(float(remaining_legs.sum()))
                     
                     progress_pct = ((distance - remaining) / distance) * 100 if distance > 0 else 0
                     eta = est_time(remaining, selected_speed)
@@ -3192,11 +3322,10 @@ def main():
                     st.markdown(f'<span style="background:{badge_color};color:white;padding:4px 12px;border-radius:20px;font-size:0.8rem;">{badge_text}</span>', unsafe_allow_html=True)
                     
                     cumulative = 0
+                    legs = segment_distances_km(path, all_locations)
                     for i in range(len(path) - 1):
                         frm, to = path[i], path[i+1]
-                        seg_straight = calculate_distance_km(all_locations[frm]["lat"], all_locations[frm]["lon"],
-                                                            all_locations[to]["lat"], all_locations[to]["lon"])
-                        seg_dist = get_road_distance(seg_straight)
+                        seg_dist = get_road_distance(float(legs[i]))
                         cumulative += seg_dist
                         direction = get_direction_icon(frm, to, all_locations)
                         st.markdown(f"""
@@ -0,0 +1,94 @@
+"""
+Memory-Mappable Array Files
+A small binary container: a JSON header followed by raw, aligned NumPy
+arrays. Files are written atomically and read back as read-only memory maps,
+so processes mapping the same file share its pages.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+
+# Arrays start on this byte boundary so they can be mapped directly
+ARRAY_ALIGNMENT = 64
+
+
+def save_arrays(path, magic, header, arrays):
+    """
+    Write named arrays and a JSON header to one file.
+
+    Args:
+        path: Destination file path
+        magic: Bytes identifying the file type, checked by load_arrays()
+        header: JSON-serializable dictionary stored alongside the arrays
+        arrays: Dictionary of array name to NumPy array
+
+    The file is written under a temporary name and moved into place, so
+    readers never see a partially written file.
+    """
+    # Little-endian, C-ordered copies fix the on-disk layout
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<"))
+              for name, array in arrays.items()}
+
+    layout, position = {}, 0
+    for name, array in arrays.items():
+        position += -position % ARRAY_ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+        position += array.nbytes
+
+    header_bytes = json.dumps(dict(header, arrays=layout)).encode("utf-8")
+    # Pad the header so the data section starts on an aligned offset
+    prefix_length = len(magic) + 8 + len(header_bytes)
+    header_bytes += b" " * (-prefix_length % ARRAY_ALIGNMENT)
+    data_start = prefix_length + (-prefix_length % ARRAY_ALIGNMENT)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(magic)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(temporary, path)
+
+
+def load_arrays(path, magic):
+    """
+    Read the header of a file written by save_arrays() and map its arrays.
+
+    Args:
+        path: File path
+        magic: Expected file-type bytes
+
+    Returns:
+        tuple: (header, arrays) where arrays maps each name to a read-only
+               np.memmap (or an empty array for zero-length entries)
+
+    Raises:
+        ValueError: If the file is not of the expected type
+    """
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"'{path}' is not a {magic.decode(errors='replace')} file")
+        length_bytes = f.read(8)
+        if len(length_bytes) != 8:
+            raise ValueError(f"'{path}' is truncated")
+        (header_length,) = struct.unpack("<Q", length_bytes)
+        header = json.loads(f.read(header_length))
+
+    data_start = len(magic) + 8 + header_length
+    arrays = {}
+    for name, entry in header.pop("arrays", {}).items():
+        dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+        if not np.prod(shape, dtype=np.int64):
+            # mmap cannot map zero bytes
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.memmap(path, dtype=dtype, mode="r",
+                                 offset=data_start + entry["offset"], shape=shape)
+    return header, arrays
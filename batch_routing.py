@@ -0,0 +1,186 @@
+"""
+Batch Routing
+Command-line entry point that routes many origin/destination pairs with the
+app's find_route rules, spread over worker processes, and streams one JSON
+object per line as results finish.
+
+Usage:
+    python batch_routing.py pairs.csv --threshold 300 --workers 4 > routes.jsonl
+    cat pairs.csv | python batch_routing.py - --output routes.jsonl
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from dijkstra import ROUTING_ALGORITHMS
+from graph_cache import load_cities_and_graph
+from locations_data import get_all_locations
+from routing_engine import RoutingEngine, SNAP_CANDIDATES
+
+
+# Pairs sent to a worker per task; large enough to amortize inter-process
+# overhead, small enough that results keep streaming
+CHUNK_SIZE = 256
+
+# Header rows recognised (and skipped) in the input CSV
+HEADER_NAMES = {("source", "destination"), ("origin", "destination"), ("from", "to")}
+
+# Engine, search and snap candidates of the current worker process, set by
+# _init_worker
+_engine = None
+_algorithm = None
+_candidates = SNAP_CANDIDATES
+
+
+def read_pairs(stream):
+    """
+    Read origin/destination pairs lazily from CSV text.
+
+    The first two columns of each row are used; blank rows and a header
+    row such as "source,destination" are skipped.
+
+    Args:
+        stream: Text stream (file or sys.stdin)
+
+    Yields:
+        tuple: (index, source, destination), index counting pairs from 0;
+               destination is None for rows with a single column
+    """
+    rows = (row for row in csv.reader(stream) if any(cell.strip() for cell in row))
+    first = next(rows, None)
+    if first is None:
+        return
+    if tuple(cell.strip().lower() for cell in first[:2]) not in HEADER_NAMES:
+        rows = itertools.chain([first], rows)
+    for index, row in enumerate(rows):
+        cells = [cell.strip() for cell in row[:2]]
+        yield index, cells[0], cells[1] if len(cells) > 1 else None
+
+
+def _init_worker(csv_path, threshold_km, algorithm, candidates=SNAP_CANDIDATES):
+    # Each worker memory-maps the graph from the on-disk cache, so all
+    # processes share the same pages instead of building their own copy
+    global _engine, _algorithm, _candidates
+    _engine = RoutingEngine.from_csv(csv_path, threshold_km, get_all_locations())
+    _algorithm = algorithm
+    _candidates = candidates
+
+
+def _route_chunk(chunk):
+    # Route a list of (index, source, destination) in the current worker
+    results = []
+    for index, source, destination in chunk:
+        result = {"index": index, "source": source, "destination": destination}
+        missing = [name for name in (source, destination) if name not in _engine.locations]
+        if destination is None:
+            result["error"] = "Row has no destination"
+        elif missing:
+            result["error"] = f"Unknown location '{missing[0]}'"
+        else:
+            path, distance, mode = _engine.route(source, destination, _engine.max_threshold_km,
+                                                 algorithm=_algorithm, candidates=_candidates)
+            result.update(path=path, distance_km=distance, mode=mode)
+        results.append(result)
+    return results
+
+
+def _chunks(pairs, size):
+    iterator = iter(pairs)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def route_pairs(pairs, output, csv_path="pak_cities.csv", threshold_km=300, workers=None,
+                algorithm=None, candidates=SNAP_CANDIDATES):
+    """
+    Route pairs and write JSON-lines results as they finish.
+
+    At most a few chunks per worker are in flight at once, so neither the
+    input nor the results are ever held in memory in full. With several
+    workers results arrive out of input order; each line carries the
+    pair's "index".
+
+    Args:
+        pairs: Iterable of (index, source, destination), e.g. read_pairs()
+        output: Writable text stream
+        csv_path: City CSV the graph is built from
+        threshold_km: Edge threshold in kilometers
+        workers: Number of worker processes; None uses every CPU, 1 runs inline
+        algorithm: One of dijkstra.ROUTING_ALGORITHMS to search with, or
+                   None to read each worker's shortest-path-tree cache
+        candidates: Nearest cities each end may snap to
+
+    Returns:
+        Number of pairs written
+    """
+    # Build (or validate) the on-disk graph cache once, before workers start
+    load_cities_and_graph(csv_path, threshold_km=threshold_km)
+    workers = workers or os.cpu_count() or 1
+    written = 0
+
+    def write(results):
+        nonlocal written
+        for result in results:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        written += len(results)
+
+    if workers == 1:
+        _init_worker(csv_path, threshold_km, algorithm, candidates)
+        for chunk in _chunks(pairs, CHUNK_SIZE):
+            write(_route_chunk(chunk))
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(csv_path, threshold_km, algorithm, candidates)) as executor:
+        pending = set()
+        for chunk in _chunks(pairs, CHUNK_SIZE):
+            pending.add(executor.submit(_route_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in wait(pending).done:
+            write(future.result())
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Route origin/destination pairs in bulk.")
+    parser.add_argument("pairs", nargs="?", default="-",
+                        help="CSV file with source,destination rows ('-' or omitted: stdin)")
+    parser.add_argument("--output", "-o", default="-", help="JSON-lines output file (default: stdout)")
+    parser.add_argument("--cities", default="pak_cities.csv", help="City CSV to build the graph from")
+    parser.add_argument("--threshold", type=float, default=300, help="Edge threshold in km (default: 300)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--algorithm", choices=ROUTING_ALGORITHMS, default=None,
+                        help="Search every route with this algorithm (default: shortest-path-tree cache)")
+    parser.add_argument("--candidates", type=int, default=SNAP_CANDIDATES,
+                        help=f"Nearest cities each end may snap to (default: {SNAP_CANDIDATES})")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.pairs == "-" else open(args.pairs, newline="", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        count = route_pairs(read_pairs(source), output, args.cities, args.threshold,
+                            args.workers, args.algorithm, args.candidates)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print(f"Routed {count} pairs in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
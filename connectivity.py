@@ -0,0 +1,192 @@
+"""
+Connectivity
+Union-find (disjoint-set) structure and connected-component labelling for
+CSR graphs, so pairs of cities in different components can be rejected
+without running a search, plus a Kruskal sweep that finds the smallest
+threshold connecting any two cities.
+"""
+
+import sys
+
+import numpy as np
+
+
+class UnionFind:
+    """
+    Disjoint-set forest with union by size and path halving.
+
+    Both operations run in near-constant amortized time.
+    """
+
+    def __init__(self, size):
+        """
+        Args:
+            size: Number of elements, numbered 0 .. size - 1
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, element):
+        """Representative of the set containing element."""
+        parent = self.parent
+        while parent[element] != element:
+            # Path halving: point every other node at its grandparent
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, a, b):
+        """
+        Merge the sets containing a and b.
+
+        Returns:
+            True if two different sets were merged, False if already joined
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+
+def component_labels(graph):
+    """
+    Connected-component label of every node in a CSR graph.
+
+    Args:
+        graph: CSRGraph (or a threshold view of one)
+
+    Returns:
+        int32 NumPy array indexed by node id; two nodes share a label
+        exactly when a path connects them. Labels are numbered 0 .. k - 1
+    """
+    n = len(graph.names)
+    components = UnionFind(n)
+    for node in range(n):
+        start, end = graph.starts[node], graph.ends[node]
+        for neighbor in graph.targets[start:end].tolist():
+            # Each undirected edge is stored twice; one direction is enough
+            if neighbor > node:
+                components.union(node, neighbor)
+
+    roots = np.array([components.find(node) for node in range(n)], dtype=np.int64)
+    return np.unique(roots, return_inverse=True)[1].astype(np.int32).reshape(n)
+
+
+class KruskalSweep:
+    """
+    One Kruskal pass over a graph's edges in increasing length.
+
+    The sweep records when each pair of cities first becomes connected as
+    the edge threshold grows. Every merge of two components becomes a node
+    of a "Kruskal tree" whose weight is the merging edge's length, so the
+    smallest threshold connecting two cities (their minimax edge: the
+    longest edge on the best bottleneck path) is the weight of their lowest
+    common ancestor.
+
+    Attributes:
+        connecting_threshold_km: Smallest threshold that connects every
+                                 city, or None if even the full graph is
+                                 disconnected
+        num_components: Components left in the full graph
+    """
+
+    def __init__(self, graph):
+        """
+        Args:
+            graph: CSRGraph, usually built at the largest threshold of interest
+        """
+        self.ids = graph.ids
+        n = len(graph.names)
+
+        # Each undirected edge once, ordered by unrounded length so results
+        # line up with graph.within(threshold_km)
+        sources, slots = graph.edge_slots()
+        targets = graph.targets[slots]
+        lengths = graph.lengths[slots]
+        keep = sources < targets
+        order = np.argsort(lengths[keep], kind="stable")
+        edge_u = sources[keep][order].tolist()
+        edge_v = targets[keep][order].tolist()
+        edge_length = lengths[keep][order].tolist()
+
+        # Kruskal tree: leaves 0 .. n-1 are cities, merges get ids n, n+1, ...
+        self._parent = [-1] * max(2 * n - 1, 0)
+        self._weight = [0.0] * max(2 * n - 1, 0)
+        tree_node = list(range(n))
+        components = UnionFind(n)
+        next_node = n
+        longest = 0.0
+
+        for u, v, length in zip(edge_u, edge_v, edge_length):
+            root_u, root_v = components.find(u), components.find(v)
+            if root_u == root_v:
+                continue
+            components.union(u, v)
+            self._parent[tree_node[root_u]] = self._parent[tree_node[root_v]] = next_node
+            self._weight[next_node] = length
+            tree_node[components.find(u)] = next_node
+            next_node += 1
+            longest = length
+
+        # Merges always get larger ids than their children, so a reverse
+        # pass sees every parent before its children
+        self._depth = [0] * next_node
+        for node in range(next_node - 1, -1, -1):
+            if self._parent[node] != -1:
+                self._depth[node] = self._depth[self._parent[node]] + 1
+
+        merges = next_node - n
+        self.num_components = n - merges
+        self.connecting_threshold_km = longest if n and self.num_components == 1 else None
+
+    @property
+    def nbytes(self):
+        """Approximate memory of the Kruskal tree's Python lists."""
+        lists = (self._parent, self._weight, self._depth)
+        # List slots, one float per merge weight and one int per parent id
+        return (sum(sys.getsizeof(values) for values in lists)
+                + len(self._weight) * sys.getsizeof(0.0) + len(self._parent) * sys.getsizeof(1 << 20))
+
+    def minimax_km(self, source, destination):
+        """
+        Smallest edge threshold at which two cities become connected.
+
+        Args:
+            source: City name
+            destination: City name
+
+        Returns:
+            Length in km of the longest edge on the best bottleneck path,
+            0 for the same city, or float('inf') if never connected
+        """
+        u, v = self.ids[source], self.ids[destination]
+        parent, depth = self._parent, self._depth
+        while u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            u = parent[u]
+            if u == -1:
+                return float('inf')
+        return self._weight[u] if u >= len(self.ids) else 0.0
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    from dijkstra import load_cities, build_csr_graph
+
+    graph = build_csr_graph(load_cities("pak_cities.csv"), threshold_km=500)
+    sweep = KruskalSweep(graph)
+    print(f"Components at 500 km: {sweep.num_components}")
+    if sweep.connecting_threshold_km is None:
+        print("No threshold up to 500 km connects every city")
+    else:
+        print(f"Every city connected from {sweep.connecting_threshold_km:.1f} km")
+
+    for source, destination in (("Karachi", "Lahore"), ("Karachi", "Chaman"), ("Quetta", "Gilgit")):
+        needed = sweep.minimax_km(source, destination)
+        joined = graph.within(needed).connected(source, destination)
+        print(f"{source} ↔ {destination}: connected from {needed:.1f} km (verified: {joined})")
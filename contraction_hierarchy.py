@@ -0,0 +1,310 @@
+"""
+Contraction Hierarchies
+Preprocesses a city graph once so that later shortest-path queries only
+search "upwards" through a small hierarchy of important cities.
+"""
+
+import heapq
+import time
+
+from csr_graph import to_csr
+
+
+# Witness searches give up after settling this many nodes. Stopping early
+# only adds a few unnecessary shortcuts; it never breaks correctness.
+WITNESS_SETTLE_LIMIT = 20
+
+
+class ContractionHierarchy:
+    """
+    Contraction-hierarchies (CH) query engine for a city graph.
+
+    Preprocessing removes ("contracts") cities one at a time, least
+    important first. Whenever removing city v would break a shortest path
+    u → v → w, a shortcut edge u → w is added that remembers v as its
+    middle city. A query then runs a bidirectional Dijkstra that only
+    follows edges leading to more important cities, and shortcuts are
+    unpacked again so the result is an ordinary city-level path.
+
+    Distances always equal dijkstra()'s. When several routes are exactly
+    as short, the path may be a different one of them: each shortcut
+    remembers a single middle city, so Dijkstra's tie-break (the
+    predecessor settled first) cannot be reproduced.
+
+    Attributes:
+        names: City names indexed by node id
+        rank: Contraction order of each node (higher = more important)
+        num_shortcuts: Shortcut edges added during preprocessing
+        preprocessing_seconds: Wall-clock time spent preprocessing
+    """
+
+    def __init__(self, graph):
+        """
+        Args:
+            graph: Adjacency-list dictionary from build_graph, or CSRGraph
+        """
+        graph = to_csr(graph)
+        self.names = graph.names
+        self.ids = graph.ids
+
+        started = time.perf_counter()
+        self._preprocess(graph)
+        self.preprocessing_seconds = time.perf_counter() - started
+
+    def _preprocess(self, graph):
+        n = len(self.names)
+
+        # Working graph of not-yet-contracted nodes as {neighbor: weight} dicts
+        remaining = [{} for _ in range(n)]
+        for node in range(n):
+            start, end = graph.starts[node], graph.ends[node]
+            for neighbor, weight in zip(graph.targets[start:end].tolist(), graph.weights[start:end].tolist()):
+                if neighbor != node and weight < remaining[node].get(neighbor, float('inf')):
+                    remaining[node][neighbor] = weight
+
+        self._middle = {}
+        self._upward = [[] for _ in range(n)]
+        self.num_shortcuts = 0
+        self.rank = [0] * n
+        deleted_neighbors = [0] * n
+
+        # Lazy-update priority queue keyed by node importance
+        queue = []
+        for node in range(n):
+            priority, _ = self._importance(remaining, deleted_neighbors, node)
+            queue.append((priority, node))
+        heapq.heapify(queue)
+
+        next_rank = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+
+            # Importance may have changed since it was queued; re-check it
+            priority, _ = self._importance(remaining, deleted_neighbors, node)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, node))
+                continue
+
+            for u, w, weight in self._shortcuts_needed(remaining, node):
+                if weight < remaining[u].get(w, float('inf')):
+                    remaining[u][w] = remaining[w][u] = weight
+                    self._middle[(min(u, w), max(u, w))] = node
+                    self.num_shortcuts += 1
+
+            # Every neighbour still present is contracted later, i.e. ranks
+            # higher, so these are exactly the node's upward edges
+            self.rank[node] = next_rank
+            next_rank += 1
+            self._upward[node] = list(remaining[node].items())
+            for neighbor in remaining[node]:
+                del remaining[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+            remaining[node] = {}
+
+    def _importance(self, remaining, deleted_neighbors, node):
+        # Edge difference (shortcuts added minus edges removed) plus the
+        # number of already-contracted neighbours, to spread contraction out.
+        # Shortcuts are estimated from direct edges only; the real witness
+        # searches run once, when the node is actually contracted
+        shortcuts = self._shortcuts_needed(remaining, node, search=False)
+        priority = len(shortcuts) - len(remaining[node]) + deleted_neighbors[node]
+        return priority, shortcuts
+
+    def _shortcuts_needed(self, remaining, node, search=True):
+        # Shortcuts (u, w, weight) required to contract `node`
+        neighbors = list(remaining[node].items())
+        shortcuts = []
+        for index, (u, weight_u) in enumerate(neighbors):
+            # A direct edge u → w that is no longer than going through `node`
+            # is already a witness, which in a threshold graph is the norm
+            direct = remaining[u]
+            others = [(w, weight_u + weight_w) for w, weight_w in neighbors[index + 1:]
+                      if direct.get(w, float('inf')) > weight_u + weight_w]
+            if not others:
+                continue
+            if not search:
+                shortcuts.extend((u, w, via) for w, via in others)
+                continue
+            limit = max(via for _, via in others)
+            witness = self._witness_search(remaining, u, node, limit)
+            for w, via in others:
+                if witness.get(w, float('inf')) > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    def _witness_search(self, remaining, source, excluded, limit):
+        # Bounded Dijkstra from `source` that avoids the node being contracted
+        distances = {source: 0}
+        queue = [(0, source)]
+        settled = 0
+        while queue and settled < WITNESS_SETTLE_LIMIT:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                continue
+            settled += 1
+            for neighbor, weight in remaining[node].items():
+                if neighbor == excluded:
+                    continue
+                new_distance = distance + weight
+                # Anything beyond the limit can't be a witness; don't queue it
+                if new_distance <= limit and new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return distances
+
+    def query(self, source, destination, stats=None):
+        """
+        Shortest path between two cities using the upward CH search.
+
+        Args:
+            source: Starting city name
+            destination: Ending city name
+            stats: Optional dictionary; receives "settled" node count and
+                   "query_seconds"
+
+        Returns:
+            tuple: (path, total_distance) as in dijkstra.dijkstra(); on
+                   equal-length ties the path may differ from dijkstra()'s
+        """
+        if source not in self.ids:
+            raise ValueError(f"Source city '{source}' not found in graph")
+        if destination not in self.ids:
+            raise ValueError(f"Destination city '{destination}' not found in graph")
+
+        started = time.perf_counter()
+        source_id, target_id = self.ids[source], self.ids[destination]
+
+        # Index 0 searches up from the source, index 1 up from the destination
+        distances = ({source_id: 0}, {target_id: 0})
+        previous = ({source_id: -1}, {target_id: -1})
+        queues = ([(0, source_id)], [(0, target_id)])
+        settled = 0
+        best, meeting = float('inf'), -1
+
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                distance, node = heapq.heappop(queue)
+                if distance > distances[side][node]:
+                    continue
+                # Nothing left on this side can improve the best route
+                if distance >= best:
+                    queue.clear()
+                    continue
+                settled += 1
+
+                other = distances[1 - side].get(node)
+                if other is not None and distance + other < best:
+                    best, meeting = distance + other, node
+
+                # Stall-on-demand: if a higher city already reaches this one
+                # more cheaply, its label is not a shortest distance, so
+                # there is no point in expanding it further
+                reached = distances[side]
+                if any(reached.get(neighbor, float('inf')) + weight < distance
+                       for neighbor, weight in self._upward[node]):
+                    continue
+
+                for neighbor, weight in self._upward[node]:
+                    new_distance = distance + weight
+                    if new_distance < distances[side].get(neighbor, float('inf')):
+                        distances[side][neighbor] = new_distance
+                        previous[side][neighbor] = node
+                        heapq.heappush(queue, (new_distance, neighbor))
+
+        if stats is not None:
+            stats["settled"] = settled
+            stats["query_seconds"] = time.perf_counter() - started
+
+        if meeting == -1:
+            return None, float('inf')
+
+        # Node sequence of the hierarchy path: source → meeting → destination
+        forward = []
+        node = meeting
+        while node != -1:
+            forward.append(node)
+            node = previous[0][node]
+        forward.reverse()
+        node = previous[1][meeting]
+        while node != -1:
+            forward.append(node)
+            node = previous[1][node]
+
+        path = [self.names[forward[0]]]
+        for u, w in zip(forward, forward[1:]):
+            path.extend(self.names[node] for node in self._unpack(u, w)[1:])
+        return path, round(best, 2)
+
+    def _unpack(self, u, w):
+        # Expand a (possibly shortcut) edge into the original node sequence
+        middle = self._middle.get((min(u, w), max(u, w)))
+        if middle is None:
+            return [u, w]
+        return self._unpack(u, middle) + self._unpack(middle, w)[1:]
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    import random
+
+    from dijkstra import load_cities, build_csr_graph, dijkstra
+
+    def path_length(graph, path):
+        # Sum of the real edges along a city path, or None if a hop isn't an edge
+        total = 0.0
+        for u, w in zip(path, path[1:]):
+            start, end = graph.starts[graph.ids[u]], graph.ends[graph.ids[u]]
+            hops = dict(zip(graph.targets[start:end].tolist(), graph.weights[start:end].tolist()))
+            if graph.ids[w] not in hops:
+                return None
+            total += hops[graph.ids[w]]
+        return round(total, 2)
+
+    def report(label, cities, threshold, num_queries=300):
+        graph = build_csr_graph(cities, threshold_km=threshold)
+        hierarchy = ContractionHierarchy(graph)
+        print(f"\n{label}, threshold {threshold} km: preprocessing "
+              f"{hierarchy.preprocessing_seconds:.2f}s, {hierarchy.num_shortcuts} shortcuts")
+
+        names = [city["name"] for city in cities]
+        queries = [tuple(random.sample(names, 2)) for _ in range(num_queries)]
+        dijkstra_time = ch_time = 0
+        dijkstra_settled = ch_settled = 0
+        mismatches = bad_paths = other_paths = 0
+        for source, destination in queries:
+            dijkstra_stats, ch_stats = {}, {}
+            started = time.perf_counter()
+            expected = dijkstra(graph, source, destination, dijkstra_stats)
+            dijkstra_time += time.perf_counter() - started
+            result = hierarchy.query(source, destination, ch_stats)
+            ch_time += ch_stats["query_seconds"]
+            dijkstra_settled += dijkstra_stats["settled"]
+            ch_settled += ch_stats["settled"]
+            if result[1] != expected[1]:
+                mismatches += 1
+            if result[0] is not None:
+                # Unpacked paths must be real edges adding up to the distance;
+                # equal-length ties may pick another path than Dijkstra
+                if (result[0][0], result[0][-1]) != (source, destination) or path_length(graph, result[0]) != result[1]:
+                    bad_paths += 1
+                elif result[0] != expected[0]:
+                    other_paths += 1
+
+        print(f"  Dijkstra: {dijkstra_time / num_queries * 1000:.2f} ms/query, "
+              f"{dijkstra_settled / num_queries:.0f} settled")
+        print(f"  CH:       {ch_time / num_queries * 1000:.2f} ms/query, "
+              f"{ch_settled / num_queries:.0f} settled, distance mismatches: {mismatches}")
+        print(f"  Paths: {bad_paths} invalid, {other_paths} equally short alternatives to Dijkstra's")
+
+    random.seed(42)
+    pakistan = load_cities("pak_cities.csv")
+    for threshold in (100, 150, 300):
+        report("Pakistan", pakistan, threshold)
+
+    # Larger, sparser graphs are where the hierarchy pays off most
+    synthetic = [{"name": f"City {i}", "lat": random.uniform(24, 37), "lon": random.uniform(61, 77)}
+                 for i in range(3000)]
+    report("Synthetic 3000 cities", synthetic, 40, num_queries=200)
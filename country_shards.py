@@ -0,0 +1,321 @@
+"""
+Country Shards
+Splits the world cities dataset into one shard per country in a single
+streaming pass, prebuilds each shard's graph cache and distance tables,
+and loads shard engines lazily into a memory-bounded LRU cache, so one
+deployment can serve a whole region while only paying for the countries
+that are actually being queried.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from data_preparation import CHUNK_ROWS, extract_countries
+from distance_table import DistanceTable, build_tables, table_path
+from graph_cache import load_cities_and_graph
+from routing_engine import RoutingEngine
+
+
+# Where build_shards() writes shards by default
+SHARD_DIRECTORY = "shards"
+
+# Index of the built shards, kept in the shard directory
+MANIFEST_FILE = "manifest.json"
+
+# Distance tables are n × n matrices; larger shards are routed by search only
+TABLE_MAX_CITIES = 2000
+
+
+def country_slug(country):
+    """
+    File-system-safe name for a country, e.g. "Côte d'Ivoire" -> "c_te_d_ivoire".
+    """
+    return re.sub(r"[^a-z0-9]+", "_", country.lower()).strip("_")
+
+
+def shard_csv_path(country, directory=SHARD_DIRECTORY):
+    """
+    Cities CSV of one country's shard.
+
+    Each shard gets its own folder, with its graph cache in cache/ and its
+    distance tables in tables/ next to the CSV, e.g.
+    "shards/pakistan/pakistan_cities.csv".
+    """
+    slug = country_slug(country)
+    return os.path.join(directory, slug, f"{slug}_cities.csv")
+
+
+def _artifact_directory(csv_path, name):
+    # Graph cache and tables live next to a shard's CSV; for a CSV in the
+    # working directory this is the usual cache/ and tables/ folders
+    return os.path.join(os.path.dirname(csv_path), name)
+
+
+def build_shards(input_file, countries, max_threshold_km=500, table_thresholds=(),
+                 directory=SHARD_DIRECTORY, chunk_rows=CHUNK_ROWS):
+    """
+    Extract countries from the world cities dataset and prebuild their graphs.
+
+    All countries are extracted in one streaming pass over the input. Each
+    non-empty shard then gets its graph cache built at max_threshold_km and,
+    if it has at most TABLE_MAX_CITIES cities, a distance table per
+    threshold in table_thresholds; tables from earlier runs at other
+    thresholds are deleted. The manifest is updated so shards built in
+    earlier runs stay listed.
+
+    Args:
+        input_file: Path to worldcities.csv
+        countries: Country names as they appear in the 'country' column
+        max_threshold_km: Edge threshold of the prebuilt graphs
+        table_thresholds: Thresholds to prebuild distance tables for
+        directory: Folder to write the shards and manifest to
+        chunk_rows: Rows parsed per chunk while extracting
+
+    Returns:
+        Dictionary mapping each country to its number of cities
+    """
+    outputs = {country: shard_csv_path(country, directory) for country in countries}
+    for path in outputs.values():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    counts = extract_countries(input_file, outputs, chunk_rows)
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {"shards": {}}
+
+    for country, path in outputs.items():
+        if not counts[country]:
+            print(f"{country}: no cities found, skipped")
+            continue
+        cities, graph = load_cities_and_graph(path, threshold_km=max_threshold_km,
+                                              directory=_artifact_directory(path, "cache"))
+        thresholds = list(table_thresholds) if len(cities) <= TABLE_MAX_CITIES else []
+        tables = _artifact_directory(path, "tables")
+        written = build_tables(cities, thresholds, tables, graph.csv_sha256)
+        for stale in glob.glob(os.path.join(glob.escape(tables), "apsp_*.bin")):
+            if stale not in written:
+                os.remove(stale)
+        manifest["shards"][country] = {"csv": os.path.relpath(path, directory), "cities": counts[country],
+                                       "max_threshold_km": max_threshold_km, "table_thresholds": thresholds}
+        print(f"{country}: {counts[country]} cities, graph at {max_threshold_km:g} km, {len(thresholds)} tables")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return counts
+
+
+class ShardRegistry:
+    """
+    LRU cache of per-country RoutingEngines, loaded on first use.
+
+    Nothing is read until a country is asked for. Each loaded engine is
+    charged its RoutingEngine.nbytes, which grows as graph views are built,
+    plus any distance tables opened for it. Charges are re-read on every
+    access, and once the total goes over max_bytes the least recently used
+    countries are evicted. The most recently used country is always kept,
+    even if it alone exceeds the budget. Evicted engines stay valid for
+    callers still holding them.
+
+    The registry is safe to share between threads. Each country has its
+    own lock, so loading one shard never blocks sessions using countries
+    that are already loaded.
+
+    Distance tables are only opened for thresholds listed in
+    table_thresholds, and only used if they were built from the shard's
+    current CSV (RoutingEngine.table_matches).
+
+    Attributes:
+        shards: Mapping of country name to its cities CSV
+        table_thresholds: Mapping of country name to the thresholds it has
+                          tables for; countries not in it may use any
+        max_threshold_km: Edge threshold engines are built with
+        shard_thresholds: Mapping of country name to the edge threshold its
+                          graph cache was built at, used instead of
+                          max_threshold_km for that country
+        max_bytes: Memory budget for loaded engines
+        loads: Engines loaded so far
+        evictions: Engines evicted to stay within the budget
+    """
+
+    def __init__(self, shards, max_threshold_km=500, max_bytes=512 * 1024 * 1024, extra_locations=None,
+                 table_thresholds=None, shard_thresholds=None):
+        """
+        Args:
+            shards: Mapping of country name to the path of its cities CSV
+            max_threshold_km: Largest edge threshold that will be requested
+            max_bytes: Memory budget for loaded engines in bytes
+            extra_locations: Optional mapping of country name to its extra
+                             places ({name: (lat, lon)})
+            table_thresholds: Optional mapping of country name to the
+                              thresholds with prebuilt tables
+            shard_thresholds: Optional mapping of country name to the
+                              threshold of its prebuilt graph cache
+        """
+        self.shards = dict(shards)
+        self.table_thresholds = {country: set(thresholds)
+                                 for country, thresholds in (table_thresholds or {}).items()}
+        self.max_threshold_km = max_threshold_km
+        self.shard_thresholds = dict(shard_thresholds or {})
+        self.max_bytes = max_bytes
+        self.extra_locations = dict(extra_locations or {})
+        self.loads = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # _lock guards the LRU bookkeeping only; loading a shard or opening
+        # its tables holds that country's lock instead
+        self._lock = threading.Lock()
+        self._country_locks = {country: threading.Lock() for country in self.shards}
+
+    @classmethod
+    def from_manifest(cls, directory=SHARD_DIRECTORY, max_threshold_km=500, **kwargs):
+        """
+        Registry over the shards listed in a directory's manifest.
+
+        Each engine is built at the threshold its shard's graph cache was
+        built at, so the prebuilt cache is used.
+
+        Raises:
+            FileNotFoundError: If no shards have been built in directory
+            ValueError: If a shard was built below max_threshold_km
+        """
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if not manifest["shards"]:
+            raise FileNotFoundError(f"No shards listed in '{directory}'")
+        shards = {country: os.path.join(directory, shard["csv"]) for country, shard in manifest["shards"].items()}
+        tables = {country: shard["table_thresholds"] for country, shard in manifest["shards"].items()}
+        built = {country: shard["max_threshold_km"] for country, shard in manifest["shards"].items()}
+        for country, threshold in built.items():
+            if threshold < max_threshold_km:
+                raise ValueError(f"Shard '{country}' was built at {threshold:g} km but {max_threshold_km:g} km "
+                                 f"is needed; rebuild it with --threshold {max_threshold_km:g}")
+        return cls(shards, max_threshold_km, table_thresholds=tables, shard_thresholds=built, **kwargs)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Memory charged for loaded engines at the last access."""
+        return self._bytes
+
+    def countries(self):
+        """Names of all available countries, sorted."""
+        return sorted(self.shards)
+
+    def _touch(self, country):
+        # Loaded entry for a country marked as recently used, or None;
+        # caller holds self._lock
+        entry = self._entries.get(country)
+        if entry is not None:
+            self._entries.move_to_end(country)
+        return entry
+
+    def _charge(self):
+        # Re-read every engine's size and evict down to the budget; caller
+        # holds self._lock
+        self._bytes = sum(entry["engine"].nbytes + entry["table_bytes"] for entry in self._entries.values())
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["engine"].nbytes + entry["table_bytes"]
+            self.evictions += 1
+
+    def _entry(self, country):
+        # Loaded entry for a country, loading the shard on a miss. The
+        # country's lock makes a second session wait for the first load
+        # instead of loading the same shard again
+        path = self.shards[country]
+        with self._lock:
+            entry = self._touch(country)
+            if entry is not None:
+                self._charge()
+                return entry
+
+        with self._country_locks[country]:
+            with self._lock:
+                entry = self._touch(country)
+            if entry is None:
+                threshold = self.shard_thresholds.get(country, self.max_threshold_km)
+                engine = RoutingEngine.from_csv(path, threshold, self.extra_locations.get(country),
+                                                cache_directory=_artifact_directory(path, "cache"))
+                entry = {"engine": engine, "tables": {}, "table_bytes": 0}
+                with self._lock:
+                    self._entries[country] = entry
+                    self.loads += 1
+                    self._charge()
+        return entry
+
+    def engine(self, country):
+        """
+        RoutingEngine for a country, loading its shard on first use.
+
+        Raises:
+            KeyError: If the country has no shard
+            FileNotFoundError: If the shard's CSV is missing
+        """
+        return self._entry(country)["engine"]
+
+    def distance_table(self, country, threshold_km):
+        """
+        Prebuilt distance table of a country at one threshold.
+
+        Returns:
+            DistanceTable (memory-mapped), or None if none was built for
+            this threshold from the shard's current CSV
+        """
+        entry = self._entry(country)
+        with self._country_locks[country]:
+            if threshold_km not in entry["tables"]:
+                table = None
+                listed = self.table_thresholds.get(country)
+                if listed is None or threshold_km in listed:
+                    path = table_path(threshold_km, _artifact_directory(self.shards[country], "tables"))
+                    try:
+                        table = DistanceTable.load(path)
+                    except (OSError, ValueError):
+                        pass
+                if table is not None and not entry["engine"].table_matches(table, threshold_km):
+                    table = None
+                entry["tables"][threshold_km] = table
+                if table is not None:
+                    entry["table_bytes"] += table.distances.nbytes + table.next_hop.nbytes
+                    with self._lock:
+                        self._charge()
+            return entry["tables"][threshold_km]
+
+
+# Build step: shard the world cities dataset
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build per-country city shards with prebuilt graphs.")
+    parser.add_argument("countries", nargs="*", default=["Pakistan"],
+                        help="Countries to extract, as named in the dataset (default: Pakistan)")
+    parser.add_argument("--input", default="simplemaps_worldcities_basicv1.901/worldcities.csv",
+                        help="World cities CSV")
+    parser.add_argument("--output", default=SHARD_DIRECTORY, help=f"Shard folder (default: {SHARD_DIRECTORY})")
+    parser.add_argument("--threshold", type=float, default=500,
+                        help="Edge threshold of the prebuilt graphs in km (default: 500)")
+    parser.add_argument("--tables", action="store_true",
+                        help="Also prebuild distance tables for every range-slider value (100-500 km)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    build_shards(args.input, args.countries, args.threshold,
+                 range(100, 525, 25) if args.tables else (), args.output)
+    print(f"Built {len(args.countries)} shards in {time.perf_counter() - started:.1f}s")
+
+    # Load every shard once to show what the registry charges for it
+    registry = ShardRegistry.from_manifest(args.output, args.threshold)
+    for country in registry.countries():
+        engine = registry.engine(country)
+        print(f"{country}: {len(engine.cities)} cities, {engine.nbytes / 2**20:.1f} MiB")
@@ -0,0 +1,299 @@
+"""
+Compact Graph Storage
+Compressed-sparse-row (CSR) representation of the city graph with integer
+node ids, so large graphs don't pay Python object overhead per edge.
+"""
+
+import copy
+from collections.abc import Mapping
+
+import numpy as np
+
+from connectivity import component_labels
+
+
+class CSRGraph(Mapping):
+    """
+    Undirected weighted graph stored as three flat arrays.
+
+    The neighbours of node `u` are `targets[starts[u]:ends[u]]` with
+    matching `weights`, ordered by increasing distance. Node ids follow sorted
+    city-name order, so comparing ids breaks priority-queue ties exactly like
+    comparing names does in the dictionary version of the graph.
+
+    For a full graph `starts` and `ends` are just `offsets[:-1]` and
+    `offsets[1:]`. within() moves the ends forward to cut each node's list
+    down to a shorter edge threshold while sharing every array.
+
+    The class also behaves like the old adjacency-list dictionary
+    (`graph[name]` returns a list of (neighbor, distance) tuples), so code
+    written against build_graph keeps working unchanged.
+    """
+
+    def __init__(self, names, offsets, targets, weights, lengths=None):
+        """
+        Args:
+            names: List of city names indexed by node id
+            offsets: Array of length n + 1 with each node's first edge slot
+            targets: Array of neighbour node ids
+            weights: Array of edge distances in kilometers
+            lengths: Optional unrounded distances that within() filters on;
+                     defaults to weights
+        """
+        self.names = list(names)
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.lengths = self.weights if lengths is None else np.asarray(lengths, dtype=np.float64)
+        self.starts = self.offsets[:-1]
+        self.ends = self.offsets[1:]
+        self.threshold_km = None
+        self._components = None
+        self._int_weights = None
+        self._dense_weights = None
+
+    @classmethod
+    def from_edges(cls, names, edge_i, edge_j, weights, lengths=None):
+        """
+        Build a graph from undirected edges given as index arrays.
+
+        Args:
+            names: City name for each index used in edge_i / edge_j
+            edge_i, edge_j: Arrays of endpoint indices (one entry per edge)
+            weights: Array of edge distances in kilometers
+            lengths: Optional unrounded distances used for ordering and by
+                     within(); defaults to weights
+
+        Returns:
+            CSRGraph
+        """
+        # Intern names in sorted order; repeated names share one node
+        node_names = sorted(set(names))
+        ids = {name: node_id for node_id, name in enumerate(node_names)}
+        remap = np.array([ids[name] for name in names], dtype=np.int64)
+
+        edge_i = remap[np.asarray(edge_i, dtype=np.int64)]
+        edge_j = remap[np.asarray(edge_j, dtype=np.int64)]
+        weights = np.asarray(weights, dtype=np.float64)
+        lengths = weights if lengths is None else np.asarray(lengths, dtype=np.float64)
+
+        # Store every edge in both directions, grouped by source node and
+        # shortest first so within() can cut each list at a threshold
+        sources = np.concatenate((edge_i, edge_j))
+        targets = np.concatenate((edge_j, edge_i))
+        weights = np.concatenate((weights, weights))
+        lengths = np.concatenate((lengths, lengths))
+        order = np.lexsort((targets, lengths, sources))
+
+        counts = np.bincount(sources, minlength=len(node_names))
+        offsets = np.zeros(len(node_names) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(node_names, offsets, targets[order], weights[order], lengths[order])
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list):
+        """
+        Convert an adjacency-list dictionary into CSR form.
+
+        Args:
+            adjacency_list: Dictionary mapping each city to (neighbor, distance) tuples
+
+        Returns:
+            CSRGraph
+        """
+        names = sorted(adjacency_list)
+        ids = {name: node_id for node_id, name in enumerate(names)}
+
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        targets, weights = [], []
+        for node_id, name in enumerate(names):
+            # Keep each node's edges ordered by distance, as from_edges does
+            for distance, target in sorted((distance, ids[neighbor]) for neighbor, distance in adjacency_list[name]):
+                targets.append(target)
+                weights.append(distance)
+            offsets[node_id + 1] = len(targets)
+
+        return cls(names, offsets, targets, weights)
+
+    def neighbors(self, node_id):
+        """
+        Get the neighbours of a node as array slices.
+
+        Args:
+            node_id: Integer node id
+
+        Returns:
+            tuple: (target ids, edge weights) as NumPy array views
+        """
+        start, end = self.starts[node_id], self.ends[node_id]
+        return self.targets[start:end], self.weights[start:end]
+
+    @property
+    def int_weights(self):
+        """
+        Edge weights as whole multiples of 0.01 km (decametres), int64.
+
+        Weights are rounded to 0.01 km when the graph is built, so the
+        conversion is exact. Computed on first use and shared with views.
+        """
+        if self._int_weights is None:
+            self._int_weights = np.rint(self.weights * 100).astype(np.int64)
+        return self._int_weights
+
+    def edge_slots(self):
+        """
+        Every edge kept by this graph as flat arrays.
+
+        A view trims each node's range, so its edges are not one contiguous
+        block of the shared buffers.
+
+        Returns:
+            tuple: (source node ids, positions in targets / weights / lengths)
+        """
+        counts = self.ends - self.starts
+        sources = np.repeat(np.arange(len(self.names)), counts)
+        slots = np.arange(counts.sum()) + np.repeat(self.starts - (np.cumsum(counts) - counts), counts)
+        return sources, slots
+
+    @property
+    def num_edges(self):
+        """Number of undirected edges in the graph."""
+        return int((self.ends - self.starts).sum()) // 2
+
+    @property
+    def density(self):
+        """Fraction of all possible city pairs joined by an edge (0 to 1)."""
+        n = len(self.names)
+        return 2 * self.num_edges / (n * (n - 1)) if n > 1 else 0.0
+
+    @property
+    def dense_weights(self):
+        """
+        n × n float64 matrix of edge weights, inf where there is no edge.
+
+        Built on first use and kept with the graph (8 bytes per city pair),
+        so only worth it for small, dense graphs.
+        """
+        if self._dense_weights is None:
+            n = len(self.names)
+            sources, slots = self.edge_slots()
+            matrix = np.full((n, n), np.inf)
+            matrix[sources, self.targets[slots]] = self.weights[slots]
+            self._dense_weights = matrix
+        return self._dense_weights
+
+    def within(self, threshold_km):
+        """
+        View of the graph keeping only edges of at most threshold_km.
+
+        Nothing is recomputed or copied: the view shares names, ids and the
+        edge arrays with this graph, and only gets its own `ends` array.
+
+        Args:
+            threshold_km: Maximum edge distance in kilometers
+
+        Returns:
+            CSRGraph view
+        """
+        if self.threshold_km is not None and threshold_km > self.threshold_km:
+            raise ValueError(
+                f"Cannot widen a {self.threshold_km:g} km graph to {threshold_km:g} km"
+            )
+
+        # Each node's edges are sorted by weight, so the kept edges are a
+        # prefix; count them per node with one cumulative sum
+        kept = np.zeros(len(self.weights) + 1, dtype=np.int64)
+        np.cumsum(self.lengths <= threshold_km, out=kept[1:])
+        counts = kept[self.ends] - kept[self.starts]
+
+        view = copy.copy(self)
+        view.ends = self.starts + counts
+        view.threshold_km = threshold_km
+        view._components = None
+        view._dense_weights = None
+        return view
+
+    @property
+    def components(self):
+        """
+        Connected-component label of every node, indexed by node id.
+
+        Computed with union-find on first use and kept with the graph.
+        """
+        if self._components is None:
+            self._components = component_labels(self)
+        return self._components
+
+    def connected(self, source, destination):
+        """
+        Whether any path joins two cities, in O(1) once labels exist.
+
+        Args:
+            source: City name
+            destination: City name
+
+        Returns:
+            bool
+        """
+        labels = self.components
+        return bool(labels[self.ids[source]] == labels[self.ids[destination]])
+
+    def precompute(self, components=False, int_weights=False, dense_weights=False):
+        """
+        Build lazily cached arrays now instead of inside a later query.
+
+        Args:
+            components: Label the connected components
+            int_weights: Convert the weights to integers
+            dense_weights: Build the n × n weight matrix
+
+        Returns:
+            The graph itself
+        """
+        if components:
+            self.components
+        if int_weights:
+            self.int_weights
+        if dense_weights:
+            self.dense_weights
+        return self
+
+    def to_adjacency(self):
+        """
+        Expand back into the adjacency-list dictionary used by build_graph.
+
+        Returns:
+            Dictionary mapping each city to list of (neighbor, distance) tuples
+        """
+        return {name: self[name] for name in self.names}
+
+    # Mapping interface: lets the CSR graph stand in for the dictionary
+    def __getitem__(self, name):
+        targets, weights = self.neighbors(self.ids[name])
+        return [(self.names[t], w) for t, w in zip(targets.tolist(), weights.tolist())]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+
+def to_csr(graph):
+    """
+    Return the graph in CSR form, converting adjacency-list dictionaries.
+
+    Args:
+        graph: CSRGraph or adjacency-list dictionary
+
+    Returns:
+        CSRGraph
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_adjacency(graph)
@@ -1,49 +1,109 @@
 """
 Phase 1: Data Preparation
-Filters the world cities dataset to keep only Pakistani cities.
+Filters the world cities dataset to keep only Pakistani cities (or any set
+of countries, in one streaming pass).
 Extracts: City Name, Latitude, Longitude
 """
 
 import pandas as pd
 
-def filter_pakistani_cities(input_file, output_file):
+
+# The only columns read from worldcities.csv, with explicit types so pandas
+# never has to infer them; every other column is skipped while parsing
+SOURCE_COLUMNS = {"city": str, "lat": "float64", "lng": "float64", "country": str}
+
+# Rows parsed at a time: peak memory depends on this, not on the file size
+CHUNK_ROWS = 50000
+
+# Column names of the per-country output files (e.g. pak_cities.csv)
+OUTPUT_COLUMNS = ['City', 'Latitude', 'Longitude']
+
+
+def stream_country_rows(input_file, countries, chunk_rows=CHUNK_ROWS):
     """
-    Filter the world cities dataset to keep only Pakistani cities.
+    Read the world cities dataset in chunks, keeping only some countries.
     
     Args:
-        input_file: Path to the original worldcities.csv
-        output_file: Path to save the filtered Pakistani cities
+        input_file: Path to worldcities.csv
+        countries: Country names as they appear in the 'country' column
+        chunk_rows: Rows parsed per chunk
     
-    Returns:
-        DataFrame with Pakistani cities
+    Yields:
+        tuple: (country, DataFrame) with the OUTPUT_COLUMNS of that
+               country's rows in one chunk, in file order
     """
-    # Step 1: Load the dataset
-    print("Loading world cities dataset...")
-    df = pd.read_csv(input_file)
+    wanted = list(countries)
+    with pd.read_csv(input_file, usecols=list(SOURCE_COLUMNS), dtype=SOURCE_COLUMNS,
+                     chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = chunk[chunk['country'].isin(wanted)]
+            for country, rows in chunk.groupby('country', sort=False):
+                rows = rows[['city', 'lat', 'lng']]
+                rows.columns = OUTPUT_COLUMNS
+                yield country, rows
+
+
+def extract_countries(input_file, outputs, chunk_rows=CHUNK_ROWS):
+    """
+    Write one cleaned cities CSV per country in a single streaming pass.
     
-    print(f"Total cities in dataset: {len(df)}")
+    Each country's rows are appended to its file as chunks arrive, and
+    duplicate city names are dropped (the first one in the file is kept),
+    so only one chunk plus the names written so far are ever in memory.
     
-    # Step 2: Filter for Pakistan only
-    # Using the 'country' column to filter
-    pakistan_df = df[df['country'] == 'Pakistan']
+    Args:
+        input_file: Path to worldcities.csv
+        outputs: Mapping of country name to the CSV path to write
+        chunk_rows: Rows parsed per chunk
     
-    print(f"Cities in Pakistan: {len(pakistan_df)}")
+    Returns:
+        Dictionary mapping each country to the number of cities written
+    """
+    seen = {country: set() for country in outputs}
+    files = {}
+    try:
+        for country, rows in stream_country_rows(input_file, outputs, chunk_rows):
+            rows = rows.drop_duplicates(subset=['City'])
+            rows = rows[~rows['City'].isin(seen[country])]
+            seen[country].update(rows['City'])
+            if country not in files:
+                files[country] = open(outputs[country], 'w', newline='', encoding='utf-8')
+                rows.to_csv(files[country], index=False)
+            else:
+                rows.to_csv(files[country], index=False, header=False)
+    finally:
+        for handle in files.values():
+            handle.close()
     
-    # Step 3: Extract only the required columns
-    # Rename columns to match project requirements
-    cleaned_df = pakistan_df[['city', 'lat', 'lng']].copy()
-    cleaned_df.columns = ['City', 'Latitude', 'Longitude']
+    # Countries that never appeared still get a (header-only) file
+    for country, path in outputs.items():
+        if country not in files:
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(path, index=False)
     
-    # Step 4: Remove any duplicates and reset index
-    cleaned_df = cleaned_df.drop_duplicates(subset=['City']).reset_index(drop=True)
+    return {country: len(names) for country, names in seen.items()}
+
+
+def filter_pakistani_cities(input_file, output_file, chunk_rows=CHUNK_ROWS):
+    """
+    Filter the world cities dataset to keep only Pakistani cities.
     
-    print(f"Unique Pakistani cities after cleanup: {len(cleaned_df)}")
+    Args:
+        input_file: Path to the original worldcities.csv
+        output_file: Path to save the filtered Pakistani cities
+        chunk_rows: Rows parsed per chunk
+    
+    Returns:
+        DataFrame with Pakistani cities
+    """
+    # Step 1: Stream the dataset, keeping Pakistani rows as they go by
+    print("Streaming world cities dataset...")
+    counts = extract_countries(input_file, {"Pakistan": output_file}, chunk_rows)
     
-    # Step 5: Save to CSV
-    cleaned_df.to_csv(output_file, index=False)
+    print(f"Unique Pakistani cities after cleanup: {counts['Pakistan']}")
     print(f"Saved filtered data to: {output_file}")
     
-    return cleaned_df
+    # Step 2: The filtered file is small; load it for the caller
+    return pd.read_csv(output_file)
 
 
 if __name__ == "__main__":
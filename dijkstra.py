@@ -7,6 +7,13 @@ import math
 import csv
 import heapq
 
+import numpy as np
+
+from csr_graph import CSRGraph, to_csr
+from radix_heap import RadixHeap
+from search_workspace import default_workspace
+from spatial_index import CityGrid
+
 
 def calculate_distance_km(lat1, lon1, lat2, lon2):
     """
@@ -42,6 +49,68 @@ def calculate_distance_km(lat1, lon1, lat2, lon2):
     return distance
 
 
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Vectorized Haversine distance for arrays of coordinates.
+    
+    Same formula as calculate_distance_km, but evaluated with NumPy so a
+    whole batch of distances costs one call instead of one per pair.
+    Inputs broadcast against each other like any NumPy expression.
+    
+    Args:
+        lat1, lon1: Latitude(s) and longitude(s) of first point(s)
+        lat2, lon2: Latitude(s) and longitude(s) of second point(s)
+    
+    Returns:
+        NumPy array of distances in kilometers
+    """
+    lat1_rad = np.radians(lat1)
+    lon1_rad = np.radians(lon1)
+    lat2_rad = np.radians(lat2)
+    lon2_rad = np.radians(lon2)
+
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
+    # Clip guards against rounding pushing sqrt(a) just past 1
+    c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    R = 6371
+    return R * c
+
+
+def pairwise_distances_km(lats1, lons1, lats2, lons2):
+    """
+    Distance matrix between two sets of points.
+    
+    Args:
+        lats1, lons1: Arrays of length n for the first set
+        lats2, lons2: Arrays of length m for the second set
+    
+    Returns:
+        NumPy array of shape (n, m) with distances in kilometers
+    """
+    lats1, lons1 = np.asarray(lats1, dtype=float), np.asarray(lons1, dtype=float)
+    lats2, lons2 = np.asarray(lats2, dtype=float), np.asarray(lons2, dtype=float)
+    return haversine_km(lats1[:, None], lons1[:, None], lats2[None, :], lons2[None, :])
+
+
+def city_coordinate_arrays(cities):
+    """
+    Pack city coordinates into NumPy arrays for batched distance calls.
+    
+    Args:
+        cities: List of city dictionaries
+    
+    Returns:
+        tuple: (lats, lons) as float arrays in the same order as cities
+    """
+    lats = np.array([city["lat"] for city in cities], dtype=float)
+    lons = np.array([city["lon"] for city in cities], dtype=float)
+    return lats, lons
+
+
 def load_cities(filepath):
     """
     Load Pakistani cities from CSV file.
@@ -64,6 +133,56 @@ def load_cities(filepath):
     return cities
 
 
+def round_km(distances):
+    """
+    Round an array of distances to 0.01 km exactly like Python's round().
+    
+    NumPy rounds by scaling by 100, which can land on the other side of a
+    tie than round(x, 2) does. The rare values sitting right at a tie are
+    re-rounded in Python so both graph builders produce identical weights.
+    
+    Args:
+        distances: NumPy array of distances in kilometers
+    
+    Returns:
+        NumPy array of rounded distances
+    """
+    rounded = np.round(distances, 2)
+    scaled = distances * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_tie).tolist():
+        rounded[index] = round(float(distances[index]), 2)
+    return rounded
+
+
+def find_edges(cities, threshold_km):
+    """
+    Find every pair of cities within the threshold distance.
+    
+    Args:
+        cities: List of city dictionaries
+        threshold_km: Maximum distance (km) to create an edge between cities
+    
+    Returns:
+        tuple: (edge_i, edge_j, distances) arrays with edge_i < edge_j,
+               sorted by (edge_i, edge_j), distances unrounded
+    """
+    lats, lons = city_coordinate_arrays(cities)
+    
+    # Bucket cities into a spatial grid so only nearby pairs are compared
+    grid = CityGrid(lats, lons, threshold_km)
+    edge_i, edge_j = grid.candidate_pairs()
+    
+    # Measure every candidate pair in one batch and keep those within range
+    edge_dist = haversine_km(lats[edge_i], lons[edge_i], lats[edge_j], lons[edge_j])
+    keep = edge_dist <= threshold_km
+    edge_i, edge_j, edge_dist = edge_i[keep], edge_j[keep], edge_dist[keep]
+    
+    # Sort by (i, j) through a single combined integer key
+    order = np.argsort(edge_i * len(cities) + edge_j, kind="stable")
+    return edge_i[order], edge_j[order], edge_dist[order]
+
+
 def build_graph(cities, threshold_km=300):
     """
     Build a weighted graph connecting nearby cities.
@@ -75,37 +194,60 @@ def build_graph(cities, threshold_km=300):
     Returns:
         adjacency_list: Dictionary mapping each city to list of (neighbor, distance) tuples
     """
-    n = len(cities)
+    names = [city["name"] for city in cities]
     
     # Initialize adjacency list
-    adjacency_list = {city["name"]: [] for city in cities}
-    
-    # Calculate edges between all city pairs within threshold
-    for i in range(n):
-        for j in range(i + 1, n):
-            distance = calculate_distance_km(
-                cities[i]["lat"], cities[i]["lon"],
-                cities[j]["lat"], cities[j]["lon"]
-            )
-            
-            if distance <= threshold_km:
-                # Add edge in both directions (undirected graph)
-                adjacency_list[cities[i]["name"]].append((cities[j]["name"], round(distance, 2)))
-                adjacency_list[cities[j]["name"]].append((cities[i]["name"], round(distance, 2)))
+    adjacency_list = {name: [] for name in names}
+    
+    edge_i, edge_j, edge_dist = find_edges(cities, threshold_km)
+    first = [names[i] for i in edge_i.tolist()]
+    second = [names[j] for j in edge_j.tolist()]
+    weights = round_km(edge_dist).tolist()
+    
+    # Pairs come sorted by (i, j) so neighbour lists match the all-pairs loop
+    for city_a, city_b, weight in zip(first, second, weights):
+        # Add edge in both directions (undirected graph)
+        adjacency_list[city_a].append((city_b, weight))
+        adjacency_list[city_b].append((city_a, weight))
     
     return adjacency_list
 
 
-def dijkstra(adjacency_list, source, destination):
+def build_csr_graph(cities, threshold_km=300):
+    """
+    Build the same graph as build_graph in compact CSR form.
+    
+    Edges go straight from NumPy arrays into the CSR buffers, so no
+    per-edge Python tuples are ever created.
+    
+    Args:
+        cities: List of city dictionaries
+        threshold_km: Maximum distance (km) to create an edge between cities
+    
+    Returns:
+        CSRGraph with one node per city name. Views for any smaller
+        threshold are available through graph.within(threshold_km)
+    """
+    names = [city["name"] for city in cities]
+    edge_i, edge_j, edge_dist = find_edges(cities, threshold_km)
+    # Unrounded distances are kept so within() cuts exactly where
+    # find_edges would for a smaller threshold
+    graph = CSRGraph.from_edges(names, edge_i, edge_j, round_km(edge_dist), lengths=edge_dist)
+    graph.threshold_km = threshold_km
+    return graph
+
+
+def dijkstra(adjacency_list, source, destination, stats=None, workspace=None):
     """
     Dijkstra's Algorithm Implementation from Scratch.
     
     Finds the shortest path between source and destination cities.
     
     Args:
-        adjacency_list: Graph represented as adjacency list
+        adjacency_list: Graph represented as adjacency list or CSRGraph
         source: Starting city name
         destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
     
     Returns:
         tuple: (path, total_distance)
@@ -113,18 +255,22 @@ def dijkstra(adjacency_list, source, destination):
             - total_distance: Total distance in kilometers
             Returns (None, float('inf')) if no path exists
     """
+    # Compact graphs have their own integer-id implementation
+    if isinstance(adjacency_list, CSRGraph):
+        return dijkstra_csr(adjacency_list, source, destination, stats, workspace)
+    
     # Validate input cities exist in graph
     if source not in adjacency_list:
         raise ValueError(f"Source city '{source}' not found in graph")
     if destination not in adjacency_list:
         raise ValueError(f"Destination city '{destination}' not found in graph")
     
-    # Initialize distances to infinity for all cities
-    distances = {city: float('inf') for city in adjacency_list}
-    distances[source] = 0
+    # Distances and predecessors are only stored for cities the search
+    # reaches; a missing entry means "infinitely far"
+    distances = {source: 0}
     
     # Track the previous city in the shortest path (for path reconstruction)
-    previous = {city: None for city in adjacency_list}
+    previous = {source: None}
     
     # Track visited cities
     visited = set()
@@ -157,13 +303,16 @@ def dijkstra(adjacency_list, source, destination):
             new_distance = current_distance + edge_weight
             
             # If this path is shorter, update the distance
-            if new_distance < distances[neighbor]:
+            if new_distance < distances.get(neighbor, float('inf')):
                 distances[neighbor] = new_distance
                 previous[neighbor] = current_city
                 heapq.heappush(priority_queue, (new_distance, neighbor))
     
+    if stats is not None:
+        stats["settled"] = len(visited)
+    
     # Reconstruct the path from destination to source
-    if distances[destination] == float('inf'):
+    if destination not in distances:
         # No path exists
         return None, float('inf')
     
@@ -180,6 +329,733 @@ def dijkstra(adjacency_list, source, destination):
     return path, round(distances[destination], 2)
 
 
+def _endpoint_ids(graph, source, destination):
+    # Validate input cities exist in a CSRGraph and look up their ids
+    if source not in graph.ids:
+        raise ValueError(f"Source city '{source}' not found in graph")
+    if destination not in graph.ids:
+        raise ValueError(f"Destination city '{destination}' not found in graph")
+    return graph.ids[source], graph.ids[destination]
+
+
+def _require_csr(graph, algorithm):
+    # Converting an adjacency-list dict costs more than one search, so
+    # point-to-point searches take a CSRGraph converted once by the caller
+    if not isinstance(graph, CSRGraph):
+        raise TypeError(f"{algorithm} needs a CSRGraph; convert the adjacency list once with to_csr()")
+
+
+def _unwind_path(graph, previous, target_id):
+    # Follow predecessor ids back from the target and return city names
+    path = []
+    current = target_id
+    while current != -1:
+        path.append(graph.names[current])
+        current = previous[current]
+    path.reverse()
+    return path
+
+
+def dijkstra_csr(graph, source, destination, stats=None, workspace=None):
+    """
+    Dijkstra's Algorithm over a CSRGraph using integer node ids.
+    
+    Same algorithm as dijkstra(), but distances and predecessors live in
+    the flat, generation-stamped arrays of a SearchWorkspace, so a query
+    costs time for the cities it touches rather than for the whole graph.
+    
+    Args:
+        graph: CSRGraph
+        source: Starting city name
+        destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
+        workspace: SearchWorkspace to reuse; defaults to the calling
+                   thread's own
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    """
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    
+    workspace = default_workspace() if workspace is None else workspace
+    generation = workspace.begin(len(graph.names))
+    distances, previous = workspace.distances, workspace.previous
+    reached, closed = workspace.reached, workspace.settled
+    distances[source_id], previous[source_id], reached[source_id] = 0, -1, generation
+    settled = 0
+    
+    priority_queue = [(0, source_id)]
+    
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        settled += 1
+        
+        if current == target_id:
+            break
+        
+        # Neighbours are one contiguous slice of the edge buffers
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            if closed[neighbor] == generation:
+                continue
+            
+            new_distance = current_distance + edge_weight
+            if reached[neighbor] != generation or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                reached[neighbor] = generation
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if reached[target_id] != generation:
+        return None, float('inf')
+    
+    return _unwind_path(graph, previous, target_id), round(distances[target_id], 2)
+
+
+def dijkstra_radix(graph, source, destination, stats=None):
+    """
+    Dijkstra's Algorithm on integer weights with a radix heap.
+    
+    Distances are summed exactly in decametres (0.01 km units), and the
+    queue is a RadixHeap instead of heapq over float tuples. Equal
+    distances are broken by node id, as in dijkstra_csr(); when two routes
+    tie exactly, float rounding noise can make dijkstra_csr() return the
+    other one, with the same total distance.
+    
+    Args:
+        graph: CSRGraph (not an adjacency-list dict; see to_csr())
+        source: Starting city name
+        destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    
+    Raises:
+        TypeError: If graph is not a CSRGraph
+    """
+    _require_csr(graph, "dijkstra_radix")
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.int_weights
+    
+    n = len(graph.names)
+    unreached = -1
+    distances = [unreached] * n
+    distances[source_id] = 0
+    previous = [-1] * n
+    visited = bytearray(n)
+    settled = 0
+    
+    queue = RadixHeap()
+    queue.push(0, source_id)
+    
+    while queue:
+        current_distance, current = queue.pop()
+        
+        if visited[current]:
+            continue
+        visited[current] = 1
+        settled += 1
+        
+        if current == target_id:
+            break
+        
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            if visited[neighbor]:
+                continue
+            
+            new_distance = current_distance + edge_weight
+            if distances[neighbor] == unreached or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                queue.push(new_distance, neighbor)
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if distances[target_id] == unreached:
+        return None, float('inf')
+    
+    return _unwind_path(graph, previous, target_id), distances[target_id] / 100
+
+
+# Edge weights are rounded to 0.01 km, so an edge can be up to 0.005 km
+# shorter than the straight line it stands for. Shrinking the straight-line
+# estimate by 1% keeps it a lower bound on every edge longer than 0.5 km.
+ASTAR_HEURISTIC_SCALE = 0.99
+
+
+def node_coordinates(graph, coordinates):
+    """
+    Coordinates of every node, aligned with the graph's node ids.
+    
+    Build this once per graph (threshold views share their base graph's
+    node ids) and pass it to astar() instead of a name mapping.
+    
+    Args:
+        graph: CSRGraph
+        coordinates: Mapping of city name to {"lat": ..., "lon": ...}
+    
+    Returns:
+        tuple: (lats, lons) lists indexed by node id
+    """
+    return ([coordinates[name]["lat"] for name in graph.names],
+            [coordinates[name]["lon"] for name in graph.names])
+
+
+class _StraightLineBound(dict):
+    # A* heuristic filled in lazily: a node's bound is computed the first
+    # time the search reaches it, so a query pays for the nodes it touches
+    # rather than for the whole graph
+    
+    def __init__(self, locate, target_lat, target_lon):
+        super().__init__()
+        self.locate = locate
+        self.target_lat = target_lat
+        self.target_lon = target_lon
+    
+    def __missing__(self, node):
+        lat, lon = self.locate(node)
+        bound = self[node] = calculate_distance_km(lat, lon, self.target_lat, self.target_lon) * ASTAR_HEURISTIC_SCALE
+        return bound
+
+
+def astar(graph, coordinates, source, destination, stats=None, workspace=None):
+    """
+    A* search using great-circle distance to the destination as heuristic.
+    
+    Roads can never beat the straight line, so the Haversine distance is a
+    lower bound on the remaining trip. Ordering the queue by
+    distance-so-far plus that bound steers the search towards the
+    destination instead of expanding evenly in every direction. Bounds
+    are only computed for nodes the search reaches.
+    
+    Args:
+        graph: CSRGraph (not an adjacency-list dict; see to_csr())
+        coordinates: (lats, lons) from node_coordinates(), or a mapping of
+                     city name to {"lat": ..., "lon": ...}
+        source: Starting city name
+        destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
+        workspace: SearchWorkspace to reuse; defaults to the calling
+                   thread's own
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    
+    Raises:
+        TypeError: If graph is not a CSRGraph
+    """
+    _require_csr(graph, "astar")
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    
+    if isinstance(coordinates, tuple):
+        lats, lons = coordinates
+        
+        def locate(node):
+            return lats[node], lons[node]
+    else:
+        names = graph.names
+        
+        def locate(node):
+            place = coordinates[names[node]]
+            return place["lat"], place["lon"]
+    heuristic = _StraightLineBound(locate, *locate(target_id))
+    
+    return goal_directed_search(graph, source, destination, heuristic, stats, workspace)
+
+
+def goal_directed_search(graph, source, destination, heuristic, stats=None, workspace=None):
+    """
+    A* search core shared by every lower-bound heuristic.
+    
+    Args:
+        graph: CSRGraph
+        source: Starting city name
+        destination: Ending city name
+        heuristic: List (or lazily filled mapping) indexed by node id
+                   with a lower bound on the remaining distance to the
+                   destination; float('inf') marks nodes that cannot
+                   reach it at all
+        stats: Optional dictionary; receives the number of "settled" nodes
+        workspace: SearchWorkspace to reuse; defaults to the calling
+                   thread's own
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    """
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    
+    workspace = default_workspace() if workspace is None else workspace
+    generation = workspace.begin(len(graph.names))
+    distances, previous = workspace.distances, workspace.previous
+    reached, closed = workspace.reached, workspace.settled
+    distances[source_id], previous[source_id], reached[source_id] = 0, -1, generation
+    settled = 0
+    
+    # Priority queue: (distance + heuristic, node id)
+    priority_queue = [(heuristic[source_id], source_id)] if heuristic[source_id] != float('inf') else []
+    
+    while priority_queue:
+        _, current = heapq.heappop(priority_queue)
+        
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        settled += 1
+        
+        if current == target_id:
+            break
+        
+        current_distance = distances[current]
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = current_distance + edge_weight
+            if reached[neighbor] != generation or new_distance < distances[neighbor]:
+                # A settled node is reopened if a shorter route turns up
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                reached[neighbor] = generation
+                closed[neighbor] = 0
+                estimate = new_distance + heuristic[neighbor]
+                if estimate != float('inf'):
+                    heapq.heappush(priority_queue, (estimate, neighbor))
+            elif new_distance == distances[neighbor] and current_distance < new_distance:
+                # Equal-length alternatives: keep the predecessor Dijkstra
+                # would have settled first (the source always comes first),
+                # so both return the same path
+                incumbent = previous[neighbor]
+                if incumbent != source_id and (current_distance, current) < (distances[incumbent], incumbent):
+                    previous[neighbor] = current
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if closed[target_id] != generation:
+        return None, float('inf')
+    
+    return _unwind_path(graph, previous, target_id), round(distances[target_id], 2)
+
+
+def shortest_path_tree(graph, source):
+    """
+    Full single-source Dijkstra: distances to every city, no early stop.
+    
+    Args:
+        graph: Adjacency-list dictionary or CSRGraph
+        source: Starting city name
+    
+    Returns:
+        tuple: (distances, previous) lists indexed by CSR node id, with
+               float('inf') / -1 for cities that cannot be reached
+    """
+    graph = to_csr(graph)
+    source_id, _ = _endpoint_ids(graph, source, source)
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    
+    n = len(graph.names)
+    distances = [float('inf')] * n
+    distances[source_id] = 0
+    previous = [-1] * n
+    visited = bytearray(n)
+    priority_queue = [(0, source_id)]
+    
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            if visited[neighbor]:
+                continue
+            new_distance = current_distance + edge_weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+    
+    return distances, previous
+
+
+def bounded_search(graph, source, max_distance_km, stats=None, workspace=None):
+    """
+    One-to-all Dijkstra that stops once distances exceed a budget.
+    
+    Answers "which cities are within X km of road from here" with a single
+    search instead of one dijkstra() call per candidate. Several start
+    cities can be given with starting offsets, as in
+    multi_endpoint_search(); each city then gets its distance from the
+    best of them, offset included.
+    
+    Args:
+        graph: Adjacency-list dictionary or CSRGraph
+        source: Starting city name, or a mapping of start city name to its
+                starting offset in km
+        max_distance_km: Distance budget in kilometers
+        stats: Optional dictionary; receives the number of "settled" nodes
+        workspace: SearchWorkspace to reuse; defaults to the calling
+                   thread's own
+    
+    Returns:
+        Dictionary mapping every city within the budget (the sources
+        included) to its shortest distance, in order of increasing distance
+    """
+    graph = to_csr(graph)
+    sources = {source: 0} if isinstance(source, str) else source
+    for name in sources:
+        if name not in graph.ids:
+            raise ValueError(f"Source city '{name}' not found in graph")
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    
+    workspace = default_workspace() if workspace is None else workspace
+    generation = workspace.begin(len(graph.names))
+    distances, touched, closed = workspace.distances, workspace.reached, workspace.settled
+    priority_queue = []
+    for name, offset in sources.items():
+        node = graph.ids[name]
+        if touched[node] != generation or offset < distances[node]:
+            distances[node], touched[node] = offset, generation
+            priority_queue.append((offset, node))
+    heapq.heapify(priority_queue)
+    reached = {}
+    
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        # Everything still queued is at least this far away
+        if current_distance > max_distance_km:
+            break
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        reached[graph.names[current]] = current_distance
+        
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            if closed[neighbor] == generation:
+                continue
+            new_distance = current_distance + edge_weight
+            # Neighbours beyond the budget are never needed; don't queue them
+            if new_distance <= max_distance_km and (touched[neighbor] != generation
+                                                    or new_distance < distances[neighbor]):
+                distances[neighbor] = new_distance
+                touched[neighbor] = generation
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+    
+    if stats is not None:
+        stats["settled"] = len(reached)
+    
+    return reached
+
+
+# Measured on the Pakistan graph: the array search overtakes the heap once
+# about 15% of city pairs are joined (around a 150 km threshold). The n × n
+# matrix costs 8 bytes per pair, so larger graphs always use the heap.
+DENSE_GRAPH_DENSITY = 0.15
+DENSE_GRAPH_MAX_CITIES = 2000
+
+
+def prefers_dense_search(graph):
+    """
+    Whether the O(V²) array search should beat the heap on this graph.
+    
+    Args:
+        graph: Adjacency-list dictionary or CSRGraph
+    
+    Returns:
+        bool
+    """
+    graph = to_csr(graph)
+    return len(graph.names) <= DENSE_GRAPH_MAX_CITIES and graph.density >= DENSE_GRAPH_DENSITY
+
+
+def _dense_search(graph, source_id, target_id=-1):
+    # Array Dijkstra: each step settles the closest unsettled city with one
+    # argmin and relaxes its whole matrix row at once. argmin returns the
+    # lowest id among equal distances, the same tie-break heapq applies.
+    weights = graph.dense_weights
+    n = len(graph.names)
+    distances = np.full(n, np.inf)
+    distances[source_id] = 0
+    previous = np.full(n, -1, dtype=np.int64)
+    # Settled cities are hidden from argmin by an inf in this copy
+    frontier = distances.copy()
+    settled = 0
+    
+    for _ in range(n):
+        current = int(frontier.argmin())
+        if frontier[current] == np.inf:
+            break
+        frontier[current] = np.inf
+        settled += 1
+        if current == target_id:
+            break
+        
+        candidates = distances[current] + weights[current]
+        # Settled cities can't improve: candidates >= their final distance
+        better = np.flatnonzero(candidates < distances)
+        distances[better] = frontier[better] = candidates[better]
+        previous[better] = current
+    
+    return distances, previous, settled
+
+
+def dijkstra_dense(graph, source, destination, stats=None):
+    """
+    O(V²) array Dijkstra over the graph's dense weight matrix.
+    
+    Every step is a handful of vectorized NumPy operations over all
+    cities, which beats a binary heap once most city pairs are joined by
+    an edge (E ≈ V²). Paths and distances are identical to dijkstra().
+    
+    Args:
+        graph: Adjacency-list dictionary from build_graph, or CSRGraph
+        source: Starting city name
+        destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    """
+    graph = to_csr(graph)
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    distances, previous, settled = _dense_search(graph, source_id, target_id)
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if distances[target_id] == np.inf:
+        return None, float('inf')
+    
+    return _unwind_path(graph, previous.tolist(), target_id), round(float(distances[target_id]), 2)
+
+
+def dense_shortest_path_tree(graph, source):
+    """
+    shortest_path_tree() computed with the O(V²) array search.
+    
+    Args:
+        graph: Adjacency-list dictionary or CSRGraph
+        source: Starting city name
+    
+    Returns:
+        tuple: (distances, previous) lists as in shortest_path_tree()
+    """
+    graph = to_csr(graph)
+    source_id, _ = _endpoint_ids(graph, source, source)
+    distances, previous, _ = _dense_search(graph, source_id)
+    return distances.tolist(), previous.tolist()
+
+
+def bidirectional_dijkstra(graph, source, destination, stats=None):
+    """
+    Bidirectional Dijkstra for point-to-point queries.
+    
+    Runs one search forward from the source and one backward from the
+    destination (the graph is undirected, so both use the same edges),
+    always advancing the side with the smaller queue head. It stops once
+    the two queue heads together can no longer beat the best meeting
+    point found so far, so each side only covers about half the trip.
+    
+    Args:
+        graph: CSRGraph (not an adjacency-list dict; see to_csr())
+        source: Starting city name
+        destination: Ending city name
+        stats: Optional dictionary; receives the number of "settled" nodes
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    
+    Raises:
+        TypeError: If graph is not a CSRGraph
+    """
+    _require_csr(graph, "bidirectional_dijkstra")
+    source_id, target_id = _endpoint_ids(graph, source, destination)
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    
+    n = len(graph.names)
+    # Index 0 is the forward search, index 1 the backward search
+    distances = ([float('inf')] * n, [float('inf')] * n)
+    previous = ([-1] * n, [-1] * n)
+    visited = (bytearray(n), bytearray(n))
+    queues = ([(0, source_id)], [(0, target_id)])
+    distances[0][source_id] = 0
+    distances[1][target_id] = 0
+    
+    # Best complete route seen so far and the node where the halves meet
+    best, meeting = float('inf'), -1
+    if source_id == target_id:
+        best, meeting = 0, source_id
+    settled = 0
+    
+    while queues[0] and queues[1]:
+        # Meet-in-the-middle stopping criterion
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_distance, current = heapq.heappop(queues[side])
+        if visited[side][current]:
+            continue
+        visited[side][current] = 1
+        settled += 1
+        
+        dist_here, dist_other = distances[side], distances[1 - side]
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = current_distance + edge_weight
+            if new_distance < dist_here[neighbor]:
+                dist_here[neighbor] = new_distance
+                previous[side][neighbor] = current
+                heapq.heappush(queues[side], (new_distance, neighbor))
+            
+            # A route through this edge joins the two searches
+            total = dist_here[neighbor] + dist_other[neighbor]
+            if total < best:
+                best, meeting = total, neighbor
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if meeting == -1:
+        return None, float('inf')
+    
+    # Forward half runs source → meeting, backward half meeting → destination
+    path = _unwind_path(graph, previous[0], meeting)
+    current = previous[1][meeting]
+    while current != -1:
+        path.append(graph.names[current])
+        current = previous[1][current]
+    
+    return path, round(best, 2)
+
+
+def multi_endpoint_search(graph, sources, targets, stats=None, workspace=None):
+    """
+    One Dijkstra between the best of several start and end cities.
+    
+    Equivalent to adding a virtual super-source with an edge of length
+    sources[c] to every start city c, and a virtual super-target reached
+    from every end city c by an edge of length targets[c], then running a
+    single search between the two. All start/end combinations are solved
+    in one pass instead of one search per pair.
+    
+    Args:
+        graph: Adjacency-list dictionary or CSRGraph
+        sources: Mapping of start city name to its starting offset in km
+                 (e.g. the distance from the real origin to that city)
+        targets: Mapping of end city name to its finishing offset in km
+        stats: Optional dictionary; receives the number of "settled" nodes
+        workspace: SearchWorkspace to reuse; defaults to the calling
+                   thread's own
+    
+    Returns:
+        tuple: (path, total) with path running from the chosen start city to
+               the chosen end city, and total including both offsets
+               (unrounded); (None, float('inf')) if no pair is connected
+    """
+    graph = to_csr(graph)
+    starts, ends, targets_array, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    for name in list(sources) + list(targets):
+        if name not in graph.ids:
+            raise ValueError(f"City '{name}' not found in graph")
+    finish = {graph.ids[name]: offset for name, offset in targets.items()}
+    
+    workspace = default_workspace() if workspace is None else workspace
+    generation = workspace.begin(len(graph.names))
+    distances, previous = workspace.distances, workspace.previous
+    reached, closed = workspace.reached, workspace.settled
+    settled = 0
+    
+    # Edges out of the super-source: every start city at its own offset
+    priority_queue = []
+    for name, offset in sources.items():
+        node = graph.ids[name]
+        if reached[node] != generation or offset < distances[node]:
+            distances[node], previous[node], reached[node] = offset, -1, generation
+            priority_queue.append((offset, node))
+    heapq.heapify(priority_queue)
+    
+    best_total, best_end = float('inf'), -1
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        # Every remaining route is at least this long: the best is final
+        if current_distance >= best_total:
+            break
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        settled += 1
+        
+        # Edge into the super-target
+        if current in finish and current_distance + finish[current] < best_total:
+            best_total, best_end = current_distance + finish[current], current
+        
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets_array[start:end].tolist(), weights[start:end].tolist()):
+            if closed[neighbor] == generation:
+                continue
+            new_distance = current_distance + edge_weight
+            if reached[neighbor] != generation or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                reached[neighbor] = generation
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+    
+    if stats is not None:
+        stats["settled"] = settled
+    
+    if best_end == -1:
+        return None, float('inf')
+    return _unwind_path(graph, previous, best_end), best_total
+
+
+# Search algorithms selectable through find_shortest_path
+ROUTING_ALGORITHMS = ("dijkstra", "astar", "bidirectional", "radix")
+
+
+def find_shortest_path(graph, source, destination, algorithm="dijkstra", coordinates=None, stats=None):
+    """
+    Run the selected shortest-path algorithm between two cities.
+    
+    Args:
+        graph: CSRGraph; an adjacency-list dictionary only works with
+               "dijkstra" (convert it once with to_csr() for the others)
+        source: Starting city name
+        destination: Ending city name
+        algorithm: One of ROUTING_ALGORITHMS
+        coordinates: (lats, lons) from node_coordinates() or a mapping of
+                     city name to {"lat": ..., "lon": ...}; required by
+                     goal-directed algorithms such as "astar"
+        stats: Optional dictionary for search statistics
+    
+    Returns:
+        tuple: (path, total_distance) as in dijkstra()
+    """
+    if algorithm == "dijkstra":
+        return dijkstra(graph, source, destination, stats)
+    if algorithm == "bidirectional":
+        return bidirectional_dijkstra(graph, source, destination, stats)
+    if algorithm == "radix":
+        return dijkstra_radix(graph, source, destination, stats)
+    if algorithm == "astar":
+        if coordinates is None:
+            raise ValueError("A* search needs a coordinate table")
+        return astar(graph, coordinates, source, destination, stats)
+    raise ValueError(f"Unknown routing algorithm '{algorithm}'")
+
+
 def get_all_cities(filepath):
     """
     Get list of all city names from the dataset.
@@ -196,6 +1072,9 @@ def get_all_cities(filepath):
 
 # Main execution for testing
 if __name__ == "__main__":
+    import random
+    import time
+    
     # Load cities
     print("Loading Pakistani cities...")
     cities = load_cities("pak_cities.csv")
@@ -239,4 +1118,57 @@ if __name__ == "__main__":
         print(f"Total Distance: {distance2} km")
     else:
         print("No path found between these cities!")
-
+    
+    # Test A* against Dijkstra on a long query
+    print("\n" + "="*50)
+    print("Testing A* Search")
+    print("="*50)
+    
+    # The point-to-point searches take the CSR form, converted once
+    csr_graph = to_csr(graph)
+    coordinates = node_coordinates(csr_graph, {city["name"]: city for city in cities})
+    dijkstra_stats, astar_stats = {}, {}
+    expected = dijkstra(graph, "Karachi", "Peshawar", dijkstra_stats)
+    result = astar(csr_graph, coordinates, "Karachi", "Peshawar", astar_stats)
+    
+    print(f"\nKarachi → Peshawar: {result[1]} km, same path as Dijkstra: {result == expected}")
+    print(f"Cities settled - Dijkstra: {dijkstra_stats['settled']}, A*: {astar_stats['settled']}")
+    
+    # Check bidirectional search against plain Dijkstra
+    print("\n" + "="*50)
+    print("Testing Bidirectional Dijkstra")
+    print("="*50)
+    
+    names = sorted(graph)
+    mismatches = 0
+    for origin in names[::25]:
+        for target in names[::20]:
+            expected_path, expected_distance = dijkstra(graph, origin, target)
+            path3, distance3 = bidirectional_dijkstra(csr_graph, origin, target)
+            # Equal-length routes may differ, so compare distances and endpoints
+            if distance3 != expected_distance or (path3 and (path3[0], path3[-1]) != (origin, target)):
+                mismatches += 1
+                print(f"Mismatch: {origin} → {target}: {distance3} vs {expected_distance} km")
+    
+    print(f"\nCompared {len(names[::25]) * len(names[::20])} pairs, mismatches: {mismatches}")
+    
+    # Compare the O(V²) array search with the heap as the graph fills in
+    print("\n" + "="*50)
+    print("Testing Dense Array Dijkstra")
+    print("="*50)
+    
+    base = build_csr_graph(cities, threshold_km=500)
+    random.seed(3)
+    for threshold in (100, 200, 300, 400, 500):
+        view = base.within(threshold)
+        # Build the n × n matrix before timing so only the searches are measured
+        view.precompute(dense_weights=True)
+        queries = [tuple(random.sample(view.names, 2)) for _ in range(100)]
+        timings, results = {}, {}
+        for label, search in (("heap", dijkstra_csr), ("dense", dijkstra_dense)):
+            started = time.perf_counter()
+            results[label] = [search(view, s, d) for s, d in queries]
+            timings[label] = (time.perf_counter() - started) / len(queries) * 1000
+        print(f"\n{threshold} km (density {view.density:.2f}, dense picked: {prefers_dense_search(view)}): "
+              f"heap {timings['heap']:.2f} ms, dense {timings['dense']:.2f} ms, "
+              f"identical: {results['heap'] == results['dense']}")
@@ -0,0 +1,158 @@
+"""
+Many-to-Many Distance Matrices
+Computes N × M road-distance matrices between city lists with one
+single-source search per source city, optionally spread over a worker pool.
+"""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from csr_graph import to_csr
+from dijkstra import load_cities, build_csr_graph
+
+
+# Pool types accepted by distance_matrix()
+POOL_TYPES = ("thread", "process")
+
+# Graph used by process-pool workers, set once per worker by _init_worker
+_worker_graph = None
+
+
+def distances_to_targets(graph, source_id, target_ids):
+    """
+    One Dijkstra search from a source that stops once every target is settled.
+
+    Args:
+        graph: CSRGraph
+        source_id: Node id of the source city
+        target_ids: Node ids of the target cities
+
+    Returns:
+        List of distances aligned with target_ids, rounded to 0.01 km like
+        dijkstra(); float('inf') for targets that cannot be reached
+    """
+    starts, ends, targets, weights = graph.starts, graph.ends, graph.targets, graph.weights
+    n = len(graph.names)
+    distances = [float('inf')] * n
+    distances[source_id] = 0
+    visited = bytearray(n)
+
+    pending = set(target_ids)
+    priority_queue = [(0, source_id)]
+
+    while priority_queue and pending:
+        current_distance, current = heapq.heappop(priority_queue)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        pending.discard(current)
+
+        start, end = starts[current], ends[current]
+        for neighbor, edge_weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            if visited[neighbor]:
+                continue
+            new_distance = current_distance + edge_weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+
+    # Targets still pending were never settled, i.e. are unreachable
+    return [float('inf') if target in pending else round(distances[target], 2)
+            for target in target_ids]
+
+
+def _init_worker(graph):
+    # Runs once in each worker process so the graph is pickled per worker,
+    # not per source
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _worker_row(source_id, target_ids):
+    return distances_to_targets(_worker_graph, source_id, target_ids)
+
+
+def distance_matrix(sources, targets, threshold_km=300, cities=None, graph=None,
+                    workers=1, pool="thread"):
+    """
+    Road distances from every source city to every target city.
+
+    Args:
+        sources: List of source city names (matrix rows)
+        targets: List of target city names (matrix columns)
+        threshold_km: Edge threshold used when the graph has to be built
+        cities: List of city dictionaries; loaded from pak_cities.csv if
+                neither cities nor graph is given
+        graph: Prebuilt adjacency-list dictionary or CSRGraph to reuse
+        workers: Number of parallel workers; 1 runs everything inline
+        pool: "thread" or "process". Threads share the graph but the search
+              is pure Python, so only processes scale with cores
+
+    Returns:
+        float64 NumPy array of shape (len(sources), len(targets)) with
+        float('inf') for unreachable pairs
+    """
+    if pool not in POOL_TYPES:
+        raise ValueError(f"Unknown pool type '{pool}'; choose from {', '.join(POOL_TYPES)}")
+
+    if graph is None:
+        if cities is None:
+            cities = load_cities("pak_cities.csv")
+        graph = build_csr_graph(cities, threshold_km=threshold_km)
+    graph = to_csr(graph)
+
+    for name in list(sources) + list(targets):
+        if name not in graph.ids:
+            raise ValueError(f"City '{name}' not found in graph")
+    source_ids = [graph.ids[name] for name in sources]
+    target_ids = [graph.ids[name] for name in targets]
+
+    matrix = np.full((len(source_ids), len(target_ids)), np.inf)
+    if not source_ids or not target_ids:
+        return matrix
+
+    workers = min(workers or os.cpu_count() or 1, len(source_ids))
+    if workers <= 1:
+        rows = [distances_to_targets(graph, source_id, target_ids) for source_id in source_ids]
+    elif pool == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(lambda source_id: distances_to_targets(graph, source_id, target_ids),
+                                     source_ids))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,)) as executor:
+            chunksize = max(1, len(source_ids) // (workers * 4))
+            rows = list(executor.map(_worker_row, source_ids, [target_ids] * len(source_ids),
+                                     chunksize=chunksize))
+
+    for row_index, row in enumerate(rows):
+        matrix[row_index] = row
+    return matrix
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    import random
+    import time
+
+    from dijkstra import dijkstra
+
+    cities = load_cities("pak_cities.csv")
+    graph = build_csr_graph(cities, threshold_km=300)
+    names = [city["name"] for city in cities]
+    random.seed(3)
+    sources = random.sample(names, 40)
+    targets = random.sample(names, 60)
+
+    started = time.perf_counter()
+    expected = np.array([[dijkstra(graph, s, t)[1] for t in targets] for s in sources])
+    print(f"Pairwise dijkstra(): {time.perf_counter() - started:.2f}s")
+
+    for workers, pool in ((1, "thread"), (4, "thread"), (4, "process")):
+        started = time.perf_counter()
+        matrix = distance_matrix(sources, targets, graph=graph, workers=workers, pool=pool)
+        elapsed = time.perf_counter() - started
+        print(f"distance_matrix(workers={workers}, pool={pool!r}): {elapsed:.2f}s, "
+              f"matches dijkstra: {np.array_equal(matrix, expected)}")
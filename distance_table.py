@@ -0,0 +1,203 @@
+"""
+All-Pairs Distance Tables
+Precomputes every city-to-city shortest distance plus a next-hop matrix for
+one graph, writes them to a binary file and memory-maps them back, so every
+app worker process shares the same read-only pages.
+"""
+
+import os
+
+import numpy as np
+
+from array_file import save_arrays, load_arrays
+from csr_graph import to_csr
+from dijkstra import load_cities, build_csr_graph, shortest_path_tree
+from graph_cache import file_digest
+
+
+# File type marker and format version of table files
+TABLE_MAGIC = b"SPTABLE1"
+TABLE_VERSION = 3
+
+# Where build_tables() writes its files by default
+TABLE_DIRECTORY = "tables"
+
+
+def table_path(threshold_km, directory=TABLE_DIRECTORY):
+    """
+    File name used for the table of one threshold.
+
+    Args:
+        threshold_km: Edge threshold the graph was built with
+        directory: Folder holding the table files
+
+    Returns:
+        Path string, e.g. "tables/apsp_300km.bin"
+    """
+    return os.path.join(directory, f"apsp_{threshold_km:g}km.bin")
+
+
+class DistanceTable:
+    """
+    Dense all-pairs shortest-path table for a few hundred cities.
+
+    `distances[s, t]` is the road distance between node ids s and t, and
+    `next_hop[s, t]` is the first city after s on a shortest route to t.
+    Both matrices are n × n, so this suits the Pakistan dataset (about
+    1 MB per threshold) but not tens of thousands of cities.
+
+    Attributes:
+        names: City names indexed by node id
+        ids: Mapping of city name to node id
+        distances: float64 array (n, n); inf where no route exists
+        next_hop: int32 array (n, n); -1 where no route exists
+        csv_sha256: Digest of the city CSV the table was built from, or
+                    None if unknown
+    """
+
+    def __init__(self, names, distances, next_hop, csv_sha256=None):
+        self.names = list(names)
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+        self.distances = distances
+        self.next_hop = next_hop
+        self.csv_sha256 = csv_sha256
+
+    @classmethod
+    def build(cls, graph, csv_sha256=None):
+        """
+        Compute the table with one full Dijkstra per city.
+
+        Args:
+            graph: Adjacency-list dictionary or CSRGraph
+            csv_sha256: Digest of the city CSV (graph_cache.file_digest),
+                        recorded so stale tables can be recognised
+
+        Returns:
+            DistanceTable held in memory
+        """
+        graph = to_csr(graph)
+        n = len(graph.names)
+        distances = np.empty((n, n), dtype=np.float64)
+        next_hop = np.empty((n, n), dtype=np.int32)
+
+        for node_id, name in enumerate(graph.names):
+            tree_distances, previous = shortest_path_tree(graph, name)
+            distances[node_id] = tree_distances
+            # In the tree rooted at t, each city's predecessor is its next
+            # step towards t (the graph is undirected)
+            next_hop[:, node_id] = previous
+
+        return cls(graph.names, distances, next_hop, csv_sha256)
+
+    def save(self, path, threshold_km=None):
+        """
+        Write the table to a binary file that load() can memory-map.
+
+        Args:
+            path: Destination file path
+            threshold_km: Optional threshold recorded in the header
+        """
+        header = {"version": TABLE_VERSION, "threshold_km": threshold_km, "csv_sha256": self.csv_sha256,
+                  "names": self.names}
+        save_arrays(path, TABLE_MAGIC, header, {
+            "distances": np.asarray(self.distances, dtype=np.float64),
+            "next_hop": np.asarray(self.next_hop, dtype=np.int32),
+        })
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a table written by save().
+
+        Nothing is copied into process memory: pages are read from the OS
+        page cache on demand and shared by every process mapping the file.
+
+        Args:
+            path: Table file path
+
+        Returns:
+            DistanceTable backed by read-only memory maps
+        """
+        header, arrays = load_arrays(path, TABLE_MAGIC)
+        if header["version"] != TABLE_VERSION:
+            raise ValueError(f"Unsupported distance table version {header['version']}")
+
+        table = cls(header["names"], arrays["distances"], arrays["next_hop"], header["csv_sha256"])
+        table.threshold_km = header["threshold_km"]
+        return table
+
+    def distance(self, source, destination):
+        """
+        Road distance between two cities in O(1).
+
+        Returns:
+            Distance in kilometers, or float('inf') if unreachable
+        """
+        return float(self.distances[self.ids[source], self.ids[destination]])
+
+    def route(self, source, destination):
+        """
+        Shortest path by following the next-hop matrix.
+
+        Args:
+            source: Starting city name
+            destination: Ending city name
+
+        Returns:
+            tuple: (path, total_distance) as in dijkstra.dijkstra()
+        """
+        if source not in self.ids:
+            raise ValueError(f"Source city '{source}' not found in graph")
+        if destination not in self.ids:
+            raise ValueError(f"Destination city '{destination}' not found in graph")
+
+        source_id, target_id = self.ids[source], self.ids[destination]
+        total = float(self.distances[source_id, target_id])
+        if total == float('inf'):
+            return None, float('inf')
+
+        # Walk from the destination towards the source: that column is the
+        # tree rooted at the source, so ties resolve exactly as in dijkstra()
+        path = [destination]
+        current = target_id
+        while current != source_id:
+            current = int(self.next_hop[current, source_id])
+            path.append(self.names[current])
+        path.reverse()
+        return path, round(total, 2)
+
+
+def build_tables(cities, thresholds, directory=TABLE_DIRECTORY, csv_sha256=None):
+    """
+    Build and save one table per threshold.
+
+    Args:
+        cities: List of city dictionaries
+        thresholds: Iterable of edge thresholds in kilometers
+        directory: Folder to write the table files to
+        csv_sha256: Digest of the CSV the cities were read from
+
+    Returns:
+        List of written file paths
+    """
+    paths = []
+    for threshold in thresholds:
+        table = DistanceTable.build(build_csr_graph(cities, threshold_km=threshold), csv_sha256)
+        path = table_path(threshold, directory)
+        table.save(path, threshold_km=threshold)
+        paths.append(path)
+    return paths
+
+
+# Build step: precompute tables for every value of the app's range slider
+if __name__ == "__main__":
+    import time
+
+    cities = load_cities("pak_cities.csv")
+    started = time.perf_counter()
+    for path in build_tables(cities, range(100, 525, 25), csv_sha256=file_digest("pak_cities.csv")):
+        print(f"Wrote {path} ({os.path.getsize(path) // 1024} KiB)")
+    print(f"Built all tables in {time.perf_counter() - started:.1f}s")
+
+    table = DistanceTable.load(table_path(300))
+    print(f"\nKarachi → Lahore: {table.route('Karachi', 'Lahore')}")
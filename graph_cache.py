@@ -0,0 +1,186 @@
+"""
+On-Disk Graph Cache
+Stores the parsed city list and the prebuilt CSR graph in a binary file
+keyed by the city CSV's content hash and the edge threshold, so cold starts
+memory-map a ready graph instead of re-parsing the CSV and rebuilding edges.
+"""
+
+import glob
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from array_file import save_arrays, load_arrays
+from csr_graph import CSRGraph
+from dijkstra import load_cities, build_csr_graph
+
+
+# File type marker and format version; bump the version whenever the layout
+# or the graph-building rules change so old cache files are ignored
+CACHE_MAGIC = b"CITYGRPH"
+CACHE_VERSION = 1
+
+# Where cache files are kept by default
+CACHE_DIRECTORY = "cache"
+
+
+def file_digest(filepath):
+    """
+    SHA-256 hex digest of a file's contents, read in chunks.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(csv_path, digest, threshold_km, directory=CACHE_DIRECTORY):
+    """
+    Cache file name for one CSV version and threshold.
+
+    Args:
+        csv_path: Path to the city CSV
+        digest: Content digest of the CSV (from file_digest)
+        threshold_km: Edge threshold in kilometers
+        directory: Folder holding cache files
+
+    Returns:
+        Path string, e.g. "cache/pak_cities-3f2a…-500km-v1.bin"
+    """
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(directory, f"{stem}-{digest[:16]}-{threshold_km:g}km-v{CACHE_VERSION}.bin")
+
+
+def save_graph_cache(path, cities, graph, digest, threshold_km):
+    """
+    Write cities and graph to a cache file.
+
+    Args:
+        path: Destination file path
+        cities: List of city dictionaries
+        graph: CSRGraph built from the cities
+        digest: Content digest of the source CSV
+        threshold_km: Threshold the graph was built with
+    """
+    header = {
+        "version": CACHE_VERSION,
+        "csv_sha256": digest,
+        "threshold_km": threshold_km,
+        "city_names": [city["name"] for city in cities],
+        "node_names": graph.names,
+    }
+    save_arrays(path, CACHE_MAGIC, header, {
+        "lats": np.array([city["lat"] for city in cities], dtype=np.float64),
+        "lons": np.array([city["lon"] for city in cities], dtype=np.float64),
+        "offsets": graph.offsets,
+        "targets": graph.targets,
+        "weights": graph.weights,
+        "lengths": graph.lengths,
+    })
+
+
+def load_graph_cache(path, digest=None, threshold_km=None):
+    """
+    Memory-map a cache file written by save_graph_cache().
+
+    Args:
+        path: Cache file path
+        digest: If given, the CSV digest the file must have been built from
+        threshold_km: If given, the threshold the file must have been built with
+
+    Returns:
+        tuple: (cities, graph); the graph's arrays are read-only memory
+               maps and graph.csv_sha256 is the CSV digest it was built from
+
+    Raises:
+        ValueError: If the file is not a current cache for the given inputs
+    """
+    header, arrays = load_arrays(path, CACHE_MAGIC)
+    if header.get("version") != CACHE_VERSION:
+        raise ValueError(f"'{path}' has cache version {header.get('version')}, expected {CACHE_VERSION}")
+    if digest is not None and header["csv_sha256"] != digest:
+        raise ValueError(f"'{path}' was built from a different CSV")
+    if threshold_km is not None and header["threshold_km"] != threshold_km:
+        raise ValueError(f"'{path}' was built for {header['threshold_km']} km, not {threshold_km} km")
+
+    cities = [{"name": name, "lat": lat, "lon": lon}
+              for name, lat, lon in zip(header["city_names"], arrays["lats"].tolist(), arrays["lons"].tolist())]
+    graph = CSRGraph(header["node_names"], arrays["offsets"], arrays["targets"],
+                     arrays["weights"], arrays["lengths"])
+    graph.threshold_km = header["threshold_km"]
+    graph.csv_sha256 = header["csv_sha256"]
+    return cities, graph
+
+
+def load_cities_and_graph(csv_path, threshold_km=300, directory=CACHE_DIRECTORY):
+    """
+    Cities and CSR graph for a CSV, from the cache when it is current.
+
+    On a miss (no file for this CSV content and threshold, or an unreadable
+    one) the CSV is parsed, the graph built and a new cache file written.
+    Cache files left over from older versions of the same CSV are removed.
+
+    Args:
+        csv_path: Path to the city CSV
+        threshold_km: Edge threshold in kilometers
+        directory: Folder holding cache files
+
+    Returns:
+        tuple: (cities, graph), with graph.csv_sha256 set to the CSV digest
+    """
+    digest = file_digest(csv_path)
+    path = cache_path(csv_path, digest, threshold_km, directory)
+    try:
+        return load_graph_cache(path, digest, threshold_km)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    cities = load_cities(csv_path)
+    graph = build_csr_graph(cities, threshold_km=threshold_km)
+    graph.csv_sha256 = digest
+    try:
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        # Only this CSV's files: the glob alone would also match the caches
+        # of other CSVs whose names start with the same stem (pak_cities-north)
+        own = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{16}}-")
+        for stale in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(stem)}-*.bin")):
+            name = os.path.basename(stale)
+            if own.match(name) and not name.startswith(f"{stem}-{digest[:16]}-"):
+                os.remove(stale)
+        save_graph_cache(path, cities, graph, digest, threshold_km)
+    except OSError:
+        # A read-only filesystem just means every start is a cold start
+        pass
+    return cities, graph
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    import time
+
+    from dijkstra import dijkstra
+
+    started = time.perf_counter()
+    cities = load_cities("pak_cities.csv")
+    fresh = build_csr_graph(cities, threshold_km=500)
+    print(f"Parse CSV and build graph: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    load_cities_and_graph("pak_cities.csv", threshold_km=500)
+    started = time.perf_counter()
+    cached_cities, cached = load_cities_and_graph("pak_cities.csv", threshold_km=500)
+    print(f"Load from cache:           {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    same = (cached_cities == cities and cached.names == fresh.names
+            and all(np.array_equal(getattr(cached, a), getattr(fresh, a))
+                    for a in ("offsets", "targets", "weights", "lengths")))
+    print(f"Cached data identical: {same}")
+    print(f"Karachi → Lahore (300 km view): {dijkstra(cached.within(300), 'Karachi', 'Lahore')}")
@@ -0,0 +1,144 @@
+"""
+ALT Routing (A*, Landmarks, Triangle inequality)
+Precomputes exact road distances from a handful of landmark cities and uses
+them as lower bounds to steer A* searches towards the destination.
+"""
+
+import time
+
+import numpy as np
+
+from csr_graph import to_csr
+from dijkstra import goal_directed_search, shortest_path_tree
+
+
+class LandmarkIndex:
+    """
+    Landmark distance tables for ALT queries on one graph.
+
+    For any landmark L the triangle inequality gives
+    dist(v, t) >= |dist(L, t) - dist(L, v)|, and the best of these bounds
+    over all landmarks is used as the A* heuristic. Unlike the straight
+    line, it already knows about detours the threshold graph forces.
+
+    Attributes:
+        landmarks: Names of the chosen landmark cities
+        distances: Array of shape (num_landmarks, num_cities) with road
+                   distances from each landmark (inf where unreachable)
+        preprocessing_seconds: Wall-clock time spent building the tables
+    """
+
+    def __init__(self, graph, num_landmarks=8):
+        """
+        Args:
+            graph: Adjacency-list dictionary from build_graph, or CSRGraph
+            num_landmarks: How many landmark cities to pick
+        """
+        started = time.perf_counter()
+        self.graph = to_csr(graph)
+        self.landmarks = []
+        tables = []
+
+        n = len(self.graph.names)
+        if n:
+            # Farthest-point selection: start from the city farthest from an
+            # arbitrary one, then keep adding the city farthest from all
+            # landmarks so far (cities in other components count as farthest)
+            first_pass = np.array(shortest_path_tree(self.graph, self.graph.names[0])[0])
+            candidate = int(np.argmax(np.where(np.isinf(first_pass), -1, first_pass)))
+            closest = np.full(n, np.inf)
+
+            for _ in range(min(num_landmarks, n)):
+                name = self.graph.names[candidate]
+                table = np.array(shortest_path_tree(self.graph, name)[0])
+                self.landmarks.append(name)
+                tables.append(table)
+
+                closest = np.minimum(closest, table)
+                closest[candidate] = -1
+                candidate = int(np.argmax(closest))
+                if closest[candidate] <= 0:
+                    break
+
+        self.distances = np.array(tables, dtype=np.float64).reshape(len(tables), n)
+        self.preprocessing_seconds = time.perf_counter() - started
+
+    def lower_bounds(self, destination):
+        """
+        Landmark lower bound on the distance from every city to a destination.
+
+        Args:
+            destination: Ending city name
+
+        Returns:
+            NumPy array indexed by node id; inf for cities that provably
+            cannot reach the destination
+        """
+        target_id = self.graph.ids[destination]
+        to_target = self.distances[:, target_id][:, None]
+
+        with np.errstate(invalid="ignore"):
+            bounds = np.abs(to_target - self.distances)
+        # A landmark that reaches only one of the two cities proves they sit
+        # in different components; one that reaches neither says nothing
+        reaches_one = np.isinf(to_target) != np.isinf(self.distances)
+        bounds = np.where(reaches_one, np.inf, np.nan_to_num(bounds, nan=0.0))
+        if not len(bounds):
+            return np.zeros(len(self.graph.names))
+        return bounds.max(axis=0)
+
+    def query(self, source, destination, stats=None):
+        """
+        Shortest path using A* with landmark lower bounds.
+
+        Args:
+            source: Starting city name
+            destination: Ending city name
+            stats: Optional dictionary; receives the number of "settled" nodes
+
+        Returns:
+            tuple: (path, total_distance) as in dijkstra.dijkstra()
+        """
+        if destination not in self.graph.ids:
+            raise ValueError(f"Destination city '{destination}' not found in graph")
+        heuristic = self.lower_bounds(destination).tolist()
+        return goal_directed_search(self.graph, source, destination, heuristic, stats)
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    import random
+
+    from dijkstra import load_cities, build_csr_graph, dijkstra, astar
+
+    cities = load_cities("pak_cities.csv")
+    coordinates = {city["name"]: city for city in cities}
+    names = [city["name"] for city in cities]
+    random.seed(7)
+    queries = [tuple(random.sample(names, 2)) for _ in range(300)]
+
+    for threshold in (100, 200, 300):
+        graph = build_csr_graph(cities, threshold_km=threshold)
+        index = LandmarkIndex(graph, num_landmarks=8)
+        print(f"\nThreshold {threshold} km: {len(index.landmarks)} landmarks in "
+              f"{index.preprocessing_seconds:.2f}s ({index.distances.nbytes // 1024} KiB)")
+        print(f"  Landmarks: {', '.join(index.landmarks)}")
+
+        settled = {"dijkstra": 0, "astar": 0, "alt": 0}
+        mismatches = 0
+        for source, destination in queries:
+            runs = {}
+            for label, search in (
+                ("dijkstra", lambda s: dijkstra(graph, source, destination, s)),
+                ("astar", lambda s: astar(graph, coordinates, source, destination, s)),
+                ("alt", lambda s: index.query(source, destination, s)),
+            ):
+                search_stats = {}
+                runs[label] = search(search_stats)
+                settled[label] += search_stats["settled"]
+            if runs["alt"][1] != runs["dijkstra"][1]:
+                mismatches += 1
+
+        print("  Average settled: " + ", ".join(
+            f"{label} {count / len(queries):.0f}" for label, count in settled.items()
+        ) + f"; distance mismatches: {mismatches}")
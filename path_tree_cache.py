@@ -0,0 +1,161 @@
+"""
+Shortest-Path-Tree Cache
+Keeps complete single-source shortest-path trees in a memory-bounded LRU
+cache, so later routes from the same source city are read from the stored
+predecessor array instead of running another search.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from csr_graph import to_csr
+from dijkstra import shortest_path_tree
+
+
+class ShortestPathTreeCache:
+    """
+    LRU cache of shortest-path trees keyed by (source_city, threshold_km).
+
+    Each entry holds a float64 distance array and an int32 predecessor
+    array (12 bytes per city). Least recently used trees are evicted once
+    the total exceeds max_bytes. The cache is safe to share between threads.
+
+    Attributes:
+        max_bytes: Memory budget for stored trees
+        hits: Routes answered from a cached tree
+        misses: Routes that had to build a new tree
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for stored trees in bytes
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._trees)
+
+    @property
+    def nbytes(self):
+        """Memory currently used by stored trees."""
+        return self._bytes
+
+    def tree(self, graph, source, threshold_km=None, search=shortest_path_tree):
+        """
+        Shortest-path tree from a source, computed on a cache miss.
+
+        Args:
+            graph: Adjacency-list dictionary or CSRGraph
+            source: Starting city name
+            threshold_km: Threshold the graph was built for; defaults to the
+                          graph's threshold_km
+            search: Function (graph, source) -> (distances, previous) used
+                    on a miss, e.g. dijkstra.dense_shortest_path_tree
+
+        Returns:
+            tuple: (distances, previous) NumPy arrays indexed by CSR node id
+        """
+        graph = to_csr(graph)
+        if threshold_km is None:
+            threshold_km = graph.threshold_km
+        key = (source, threshold_km)
+
+        with self._lock:
+            entry = self._trees.get(key)
+            if entry is not None:
+                self._trees.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Search outside the lock so other sources aren't blocked meanwhile
+        distances, previous = search(graph, source)
+        entry = (np.array(distances, dtype=np.float64), np.array(previous, dtype=np.int32))
+        size = entry[0].nbytes + entry[1].nbytes
+
+        with self._lock:
+            if key not in self._trees:
+                self._trees[key] = entry
+                self._bytes += size
+            while self._bytes > self.max_bytes and len(self._trees) > 1:
+                _, (old_distances, old_previous) = self._trees.popitem(last=False)
+                self._bytes -= old_distances.nbytes + old_previous.nbytes
+        return entry
+
+    def route(self, graph, source, destination, threshold_km=None, search=shortest_path_tree):
+        """
+        Shortest path read from the source's cached tree.
+
+        Args:
+            graph: Adjacency-list dictionary or CSRGraph
+            source: Starting city name
+            destination: Ending city name
+            threshold_km: Threshold the graph was built for; defaults to the
+                          graph's threshold_km
+            search: Tree search used on a miss, as in tree()
+
+        Returns:
+            tuple: (path, total_distance) as in dijkstra.dijkstra()
+        """
+        graph = to_csr(graph)
+        if destination not in graph.ids:
+            raise ValueError(f"Destination city '{destination}' not found in graph")
+        distances, previous = self.tree(graph, source, threshold_km, search)
+
+        target_id = graph.ids[destination]
+        total = float(distances[target_id])
+        if total == float('inf'):
+            return None, float('inf')
+
+        path = []
+        current = target_id
+        while current != -1:
+            path.append(graph.names[current])
+            current = int(previous[current])
+        path.reverse()
+        return path, round(total, 2)
+
+    def clear(self):
+        """Drop every cached tree and reset the counters."""
+        with self._lock:
+            self._trees.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    import random
+    import time
+
+    from dijkstra import load_cities, build_csr_graph, dijkstra
+
+    cities = load_cities("pak_cities.csv")
+    graph = build_csr_graph(cities, threshold_km=300)
+    names = [city["name"] for city in cities]
+    random.seed(11)
+
+    # A session that keeps a few FROM cities and tries many destinations
+    queries = [(source, destination)
+               for source in random.sample(names, 5)
+               for destination in random.sample(names, 40)]
+
+    cache = ShortestPathTreeCache(max_bytes=64 * 1024)
+    started = time.perf_counter()
+    expected = [dijkstra(graph, s, d) for s, d in queries]
+    dijkstra_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    cached = [cache.route(graph, s, d) for s, d in queries]
+    cache_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{len(queries)} queries: dijkstra() {dijkstra_ms:.1f} ms, tree cache {cache_ms:.1f} ms")
+    print(f"Hits {cache.hits}, misses {cache.misses}, {len(cache)} trees in {cache.nbytes} bytes")
+    print(f"Identical results: {cached == expected}")
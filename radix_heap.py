@@ -0,0 +1,110 @@
+"""
+Radix Heap
+Monotone priority queue for non-negative integer keys. Dijkstra only ever
+pops keys in increasing order, so items can be kept in buckets by the
+highest bit in which they differ from the last popped key instead of in a
+comparison-based binary heap.
+"""
+
+import heapq
+
+
+class RadixHeap:
+    """
+    Priority queue of (key, node) pairs with integer keys that never go
+    below the last popped key.
+
+    Bucket 0 holds nodes whose key equals the last popped key; bucket b
+    holds keys that first differ from it in bit b - 1. A pop that finds
+    bucket 0 empty takes the smallest key of the first non-empty bucket and
+    redistributes that bucket, and every item can only move to lower
+    buckets, so each item is moved at most once per key bit.
+
+    Nodes with equal keys pop in increasing node order, the same tie-break
+    heapq applies to (distance, node) tuples.
+    """
+
+    def __init__(self, key_bits=64):
+        """
+        Args:
+            key_bits: Upper bound on the bit length of any key
+        """
+        self.last = 0
+        self._size = 0
+        self._current = []
+        self._buckets = [[] for _ in range(key_bits + 1)]
+
+    def __len__(self):
+        return self._size
+
+    def push(self, key, node):
+        """
+        Add a node with an integer key of at least the last popped key.
+        """
+        if key == self.last:
+            heapq.heappush(self._current, node)
+        else:
+            self._buckets[(key ^ self.last).bit_length()].append((key, node))
+        self._size += 1
+
+    def pop(self):
+        """
+        Remove and return the (key, node) pair with the smallest key.
+
+        Raises:
+            IndexError: If the heap is empty
+        """
+        if not self._current:
+            if not self._size:
+                raise IndexError("pop from an empty radix heap")
+            buckets = self._buckets
+            index = 1
+            while not buckets[index]:
+                index += 1
+            items = buckets[index]
+            buckets[index] = []
+            last = self.last = min(items)[0]
+            for key, node in items:
+                if key == last:
+                    self._current.append(node)
+                else:
+                    buckets[(key ^ last).bit_length()].append((key, node))
+            heapq.heapify(self._current)
+        self._size -= 1
+        return self.last, heapq.heappop(self._current)
+
+
+# Main execution for testing: integer radix-heap Dijkstra against heapq
+if __name__ == "__main__":
+    import random
+    import time
+
+    from dijkstra import load_cities, build_csr_graph, dijkstra_csr, dijkstra_radix
+
+    def synthetic_cities(count, seed):
+        # Random points over a Pakistan-sized box
+        rng = random.Random(seed)
+        return [{"name": f"City {i:05d}", "lat": rng.uniform(24, 37), "lon": rng.uniform(61, 75)}
+                for i in range(count)]
+
+    cases = [(f"Pakistan, {t} km", load_cities("pak_cities.csv"), t) for t in (100, 300, 500)]
+    cases += [("Synthetic 5,000 cities, 60 km", synthetic_cities(5000, 1), 60),
+              ("Synthetic 20,000 cities, 30 km", synthetic_cities(20000, 2), 30)]
+
+    random.seed(5)
+    for label, cities, threshold in cases:
+        graph = build_csr_graph(cities, threshold_km=threshold)
+        # Convert the weights to integers before timing, so only searches are measured
+        graph.precompute(int_weights=True)
+        queries = [tuple(random.sample(graph.names, 2)) for _ in range(50)]
+
+        timings, results = {}, {}
+        for name, search in (("heapq", dijkstra_csr), ("radix", dijkstra_radix)):
+            started = time.perf_counter()
+            results[name] = [search(graph, s, d) for s, d in queries]
+            timings[name] = (time.perf_counter() - started) / len(queries) * 1000
+
+        same = sum(a[1] == b[1] for a, b in zip(results["heapq"], results["radix"]))
+        print(f"{label:32s} {graph.num_edges:8d} edges: heapq {timings['heapq']:7.2f} ms, "
+              f"radix {timings['radix']:7.2f} ms per query ({timings['heapq'] / timings['radix']:.2f}x), "
+              f"equal distances {same}/{len(queries)}")
@@ -0,0 +1,131 @@
+"""
+Route Result Cache
+Shares finished routes between app sessions: a size-bounded LRU cache with
+per-entry expiry that also answers B → A from a cached A → B.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class RouteCache:
+    """
+    LRU cache of route results keyed by (source, destination, threshold_km).
+
+    Values are tuples whose first item is the path (a list of place names),
+    such as the (path, distance, route_mode) results of the app's
+    find_route. Because the graph is undirected, a lookup for B → A is
+    served from a cached A → B with the path reversed. Entries older than
+    ttl_seconds are treated as missing. The cache is safe to share between
+    threads.
+
+    Attributes:
+        max_entries: Number of routes kept before the least recently used
+                     one is evicted
+        ttl_seconds: Lifetime of an entry, or None for no expiry
+        hits: Lookups answered in the requested direction
+        reverse_hits: Lookups answered by reversing the opposite direction
+        misses: Lookups that found nothing usable
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        """
+        Args:
+            max_entries: Maximum number of cached routes
+            ttl_seconds: Seconds an entry stays valid; None keeps entries
+                         until they are evicted
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.reverse_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key, now):
+        # Fresh entry for key (marked as recently used), or None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, source, destination, threshold_km):
+        """
+        Cached route between two places, in the requested direction.
+
+        Args:
+            source: Starting place name
+            destination: Ending place name
+            threshold_km: Edge threshold the route was computed with
+
+        Returns:
+            Result tuple with a fresh path list, or None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            value = self._lookup((source, destination, threshold_km), now)
+            if value is not None:
+                self.hits += 1
+                return (list(value[0]),) + value[1:]
+
+            value = self._lookup((destination, source, threshold_km), now)
+            if value is not None:
+                self.reverse_hits += 1
+                return (list(reversed(value[0])),) + value[1:]
+
+            self.misses += 1
+            return None
+
+    def put(self, source, destination, threshold_km, result):
+        """
+        Store a route result.
+
+        Args:
+            source: Starting place name
+            destination: Ending place name
+            threshold_km: Edge threshold the route was computed with
+            result: Tuple whose first item is the path list
+        """
+        # Keep a private copy of the path so callers can't modify the entry
+        value = (tuple(result[0]),) + tuple(result[1:])
+        with self._lock:
+            key = (source, destination, threshold_km)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached route and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.reverse_hits = self.misses = 0
+
+
+# Main execution for testing
+if __name__ == "__main__":
+    from dijkstra import load_cities, build_csr_graph, dijkstra
+
+    graph = build_csr_graph(load_cities("pak_cities.csv"), threshold_km=300)
+    cache = RouteCache(max_entries=2, ttl_seconds=60)
+
+    for source, destination in (("Karachi", "Lahore"), ("Lahore", "Karachi"), ("Karachi", "Lahore"),
+                                ("Quetta", "Multan"), ("Peshawar", "Sukkur"), ("Lahore", "Karachi")):
+        result = cache.get(source, destination, 300)
+        if result is None:
+            result = dijkstra(graph, source, destination)
+            cache.put(source, destination, 300, result)
+        print(f"{source} → {destination}: {result[1]} km via {len(result[0])} cities")
+
+    print(f"Hits {cache.hits}, reverse hits {cache.reverse_hits}, misses {cache.misses}, "
+          f"{len(cache)} cached")
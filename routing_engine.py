@@ -0,0 +1,585 @@
+"""
+Shared Routing Engine
+One read-only object holding the cities, coordinate arrays, name index,
+location table and graph, built once per process and handed out by
+reference to every app session.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+from dijkstra import (load_cities, build_csr_graph, city_coordinate_arrays, pairwise_distances_km,
+                      calculate_distance_km, haversine_km, find_shortest_path, node_coordinates, prefers_dense_search,
+                      dijkstra_dense, shortest_path_tree, dense_shortest_path_tree, multi_endpoint_search)
+from connectivity import KruskalSweep
+from graph_cache import CACHE_DIRECTORY, file_digest, load_cities_and_graph
+from path_tree_cache import ShortestPathTreeCache
+from route_cache import RouteCache
+from spatial_index import CityGrid, typical_spacing_km
+
+
+# Places closer than this are routed directly instead of through cities
+LOCAL_ROUTE_KM = 50
+
+# Nearest cities each end of a route may snap to in the app and batch CLI;
+# the best combination wins, so a slightly farther city on a better
+# corridor can be used
+SNAP_CANDIDATES = 3
+
+# Below this many cities one vectorized Haversine pass over all of them is
+# faster than a grid lookup (measured crossover: about 3,000 cities)
+GRID_SEARCH_MIN_CITIES = 3000
+
+# Rough memory per place (its location dict, name index entries and city
+# dict) and per cached route (key, path list and LRU entry), used by
+# RoutingEngine.nbytes
+PLACE_BYTES = 400
+ROUTE_ENTRY_BYTES = 512
+
+
+def _freeze(array):
+    # Shared NumPy arrays are marked read-only so no session can modify them
+    array.flags.writeable = False
+    return array
+
+
+def _cached_nbytes(graph, base=None):
+    # Lazily built arrays of a graph, skipping any shared with its base graph
+    total = 0
+    for name in ("_components", "_int_weights", "_dense_weights"):
+        array = getattr(graph, name)
+        if array is not None and (base is None or array is not getattr(base, name)):
+            total += array.nbytes
+    return total
+
+
+def _place_path(source, destination, city_path):
+    # Wrap a city-to-city path with the real endpoints, without repeats
+    path = [source] + city_path + [destination]
+    seen, unique = set(), []
+    for p in path:
+        if p not in seen:
+            seen.add(p)
+            unique.append(p)
+    return unique
+
+
+class RoutingEngine:
+    """
+    Everything the app needs for routing, shared across sessions.
+
+    Streamlit's st.cache_data unpickles a fresh copy of its value on every
+    call, so every rerun of every session rebuilt the city list, location
+    table and graph in memory. A RoutingEngine is meant for
+    st.cache_resource instead: one instance per process, never copied.
+    Nothing in it may be mutated; session-specific locations should be
+    layered on top (e.g. with collections.ChainMap).
+
+    Attributes:
+        cities: Tuple of city dictionaries as returned by load_cities
+        names: Tuple of city names aligned with cities
+        index: Read-only mapping of city name to position in cities
+        city_coords: (lats, lons) read-only NumPy arrays aligned with cities
+        city_grid: spatial_index.CityGrid over the cities for nearest-city
+                   and radius queries on large datasets
+        locations: Read-only mapping of every routable place (cities and
+                   extra areas) to {"lat", "lon", "type"}
+        location_names: Tuple of the names in locations
+        location_coords: (lats, lons) read-only arrays aligned with location_names
+        location_nearest_city: Index into cities of each location's nearest city
+        location_nearest_km: Straight-line distance to that city
+        location_candidates: (places × SNAP_CANDIDATES) indices into cities
+                             of each location's nearest cities, closest first
+        location_candidates_km: Straight-line distances to those cities
+        max_threshold_km: Edge threshold the base graph was built with
+        graph: Base CSRGraph at max_threshold_km
+        node_coords: (lats, lons) lists aligned with the graph's node ids
+        sweep: KruskalSweep of the base graph, giving the smallest threshold
+               that connects any two cities
+        connecting_threshold_km: Smallest threshold connecting every city,
+                                 or None if max_threshold_km doesn't
+        path_trees: ShortestPathTreeCache shared by all sessions, or None
+        routes: RouteCache of finished routes shared by all sessions
+        csv_sha256: Digest of the CSV the cities came from, or None; only
+                    distance tables built from the same CSV are used
+    """
+
+    def __init__(self, cities, max_threshold_km=500, extra_locations=None, graph=None,
+                 tree_cache_bytes=32 * 1024 * 1024, csv_sha256=None):
+        """
+        Args:
+            cities: List of city dictionaries
+            max_threshold_km: Largest edge threshold that will be requested
+            extra_locations: Optional mapping of place name to (lat, lon),
+                             e.g. locations_data.get_all_locations()
+            graph: Optional CSRGraph already built from the cities at
+                   max_threshold_km (e.g. from the on-disk graph cache)
+            tree_cache_bytes: Memory budget for cached shortest-path trees;
+                              0 disables the cache
+            csv_sha256: Digest of the city CSV (graph_cache.file_digest)
+        """
+        self.csv_sha256 = csv_sha256
+        self.cities = tuple(cities)
+        self.names = tuple(city["name"] for city in self.cities)
+        self.index = MappingProxyType({name: i for i, name in enumerate(self.names)})
+        self.city_coords = tuple(_freeze(array) for array in city_coordinate_arrays(self.cities))
+
+        locations = {city["name"]: {"lat": city["lat"], "lon": city["lon"], "type": "city"}
+                     for city in self.cities}
+        for name, (lat, lon) in (extra_locations or {}).items():
+            if name not in locations:
+                locations[name] = {"lat": lat, "lon": lon, "type": "area"}
+        self.locations = MappingProxyType(locations)
+
+        self.city_grid = CityGrid(*self.city_coords, 2 * typical_spacing_km(*self.city_coords))
+
+        # Every place's nearest SNAP_CANDIDATES cities, measured once so
+        # routes and one-to-all queries (e.g. isochrones) need no per-place
+        # nearest-city lookup
+        self.location_names = tuple(locations)
+        self._location_index = {name: i for i, name in enumerate(self.location_names)}
+        self.location_coords = tuple(_freeze(np.array([place[axis] for place in locations.values()], dtype=float))
+                                     for axis in ("lat", "lon"))
+        k = min(SNAP_CANDIDATES, len(self.cities))
+        if not self.cities:
+            candidates = np.full((len(self.location_names), 1), -1)
+            candidates_km = np.full((len(self.location_names), 1), np.inf)
+        elif len(self.cities) < GRID_SEARCH_MIN_CITIES:
+            to_cities = pairwise_distances_km(*self.location_coords, *self.city_coords)
+            candidates = np.argsort(to_cities, axis=1, kind="stable")[:, :k]
+            candidates_km = np.take_along_axis(to_cities, candidates, axis=1)
+        else:
+            # A full places × cities matrix would be too large; ask the grid
+            snaps = [self._nearest(lat, lon, k) for lat, lon in zip(*self.location_coords)]
+            candidates = np.array([ids for ids, _ in snaps]).reshape(-1, k)
+            candidates_km = np.array([km for _, km in snaps]).reshape(-1, k)
+        self.location_candidates = _freeze(candidates)
+        self.location_candidates_km = _freeze(candidates_km)
+        self.location_nearest_city = self.location_candidates[:, 0]
+        self.location_nearest_km = self.location_candidates_km[:, 0]
+
+        self.max_threshold_km = max_threshold_km
+        self.graph = graph if graph is not None else build_csr_graph(self.cities, threshold_km=max_threshold_km)
+        for array in (self.graph.offsets, self.graph.targets, self.graph.weights, self.graph.lengths):
+            if array.flags.writeable:
+                _freeze(array)
+        # One Kruskal pass up front answers "which threshold first connects
+        # these cities?" for every pair without touching the graph views
+        self.sweep = KruskalSweep(self.graph)
+        # Node-id-aligned coordinates for A*, shared by every threshold view
+        self.node_coords = node_coordinates(self.graph, self.locations)
+        self.connecting_threshold_km = self.sweep.connecting_threshold_km
+        self._views = {}
+        self._table_checks = {}
+        self.path_trees = ShortestPathTreeCache(tree_cache_bytes) if tree_cache_bytes else None
+        self.routes = RouteCache()
+
+        arrays = (self.graph.offsets, self.graph.targets, self.graph.weights, self.graph.lengths,
+                  *self.city_coords, *self.location_coords, self.location_candidates, self.location_candidates_km,
+                  *(value for value in vars(self.city_grid).values() if isinstance(value, np.ndarray)))
+        self._fixed_nbytes = (sum(array.nbytes for array in arrays)
+                              + len(self.location_names) * PLACE_BYTES + self.sweep.nbytes)
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory the engine holds, growing as views are built.
+
+        Counts the engine's arrays and place tables, the Kruskal tree, the
+        trees and routes cached so far, and for every graph view created so
+        far its own `ends`, component labels, integer weights and dense
+        matrix.
+        """
+        views = list(self._views.values())
+        caches = len(self.routes) * ROUTE_ENTRY_BYTES
+        if self.path_trees is not None:
+            caches += self.path_trees.nbytes
+        return (self._fixed_nbytes + caches + _cached_nbytes(self.graph)
+                + sum(view.ends.nbytes + _cached_nbytes(view, self.graph) for view in views))
+
+    @classmethod
+    def from_csv(cls, filepath, max_threshold_km=500, extra_locations=None, use_cache=True,
+                 cache_directory=CACHE_DIRECTORY):
+        """
+        Load cities from a CSV file and build the engine.
+
+        Args:
+            filepath: Path to the cities CSV file
+            max_threshold_km: Largest edge threshold that will be requested
+            extra_locations: Optional mapping of place name to (lat, lon)
+            use_cache: Memory-map cities and graph from the on-disk graph
+                       cache (rebuilt automatically when the CSV changes)
+            cache_directory: Folder holding the graph cache files
+
+        Returns:
+            RoutingEngine
+        """
+        if not use_cache:
+            return cls(load_cities(filepath), max_threshold_km, extra_locations, csv_sha256=file_digest(filepath))
+        cities, graph = load_cities_and_graph(filepath, threshold_km=max_threshold_km, directory=cache_directory)
+        return cls(cities, max_threshold_km, extra_locations, graph=graph, csv_sha256=graph.csv_sha256)
+
+    def table_matches(self, table, threshold_km):
+        """
+        Whether a DistanceTable was built from this engine's data.
+
+        A table left over from an older CSV would silently give wrong
+        routes, so route() ignores any table whose CSV digest, city names or
+        threshold differ from the engine's. Each table is checked once.
+
+        Args:
+            table: DistanceTable
+            threshold_km: Threshold the table is about to be used for
+
+        Returns:
+            True if the table can be used
+        """
+        key = (id(table), threshold_km)
+        checked = self._table_checks.get(key)
+        if checked is None:
+            matches = (table.csv_sha256 == self.csv_sha256
+                       and getattr(table, "threshold_km", None) in (None, threshold_km)
+                       and list(table.names) == list(self.graph.names))
+            # The table is kept with its result so its id is never reused
+            checked = self._table_checks[key] = (table, matches)
+        return checked[1]
+
+    def graph_for(self, threshold_km):
+        """
+        Graph view for one edge threshold, shared by every caller.
+
+        Args:
+            threshold_km: Edge threshold in kilometers (at most max_threshold_km)
+
+        Returns:
+            CSRGraph view of the base graph
+        """
+        view = self._views.get(threshold_km)
+        if view is None:
+            view = self.graph.within(threshold_km)
+            # Component labels reject unreachable pairs in O(1); build them
+            # once here instead of inside some later query. The dense matrix
+            # is left to the first array search that needs it
+            view.precompute(components=True)
+            # Two sessions racing here just build the same cheap view twice
+            view = self._views.setdefault(threshold_km, view)
+        return view
+
+    def _nearest(self, lat, lon, k):
+        # Indices and distances of the k closest cities, closest first; ties
+        # go to the lower index, as with argmin
+        lats, lons = self.city_coords
+        if len(self.cities) >= GRID_SEARCH_MIN_CITIES:
+            candidates = self.city_grid.nearest(lat, lon, k)
+        else:
+            candidates = np.arange(len(self.cities))
+        dists = haversine_km(lat, lon, lats[candidates], lons[candidates])
+        order = np.argsort(dists, kind="stable")[:k]
+        return candidates[order], dists[order]
+
+    def nearest_cities(self, lat, lon, k=1):
+        """
+        The k closest cities to a point by straight-line distance.
+
+        Returns:
+            List of (city name, distance in km), closest first
+        """
+        ids, dists = self._nearest(lat, lon, k)
+        return [(self.names[i], km) for i, km in zip(ids.tolist(), dists.tolist())]
+
+    def nearest_city(self, lat, lon):
+        """
+        Closest city to a point by straight-line distance.
+
+        Returns:
+            tuple: (city name, distance in km), or (None, inf) without cities
+        """
+        nearest = self.nearest_cities(lat, lon, 1)
+        return nearest[0] if nearest else (None, float('inf'))
+
+    def cities_within(self, lat, lon, radius_km):
+        """
+        Every city within radius_km of a point.
+
+        Returns:
+            List of (city name, distance in km), closest first
+        """
+        lats, lons = self.city_coords
+        if len(self.cities) >= GRID_SEARCH_MIN_CITIES:
+            candidates = self.city_grid.within(lat, lon, radius_km)
+        else:
+            candidates = np.arange(len(self.cities))
+        dists = haversine_km(lat, lon, lats[candidates], lons[candidates])
+        order = np.argsort(dists, kind="stable")
+        order = order[dists[order] <= radius_km]
+        return [(self.names[i], km) for i, km in zip(candidates[order].tolist(), dists[order].tolist())]
+
+    def snap(self, name, locations=None):
+        """
+        Nearest city of a named place.
+
+        Shared places use the snap measured when the engine was built, and
+        places that carry their own "nearest_city" / "nearest_km" (e.g.
+        pins snapped when they were dropped) use theirs; anything else is
+        looked up.
+
+        Args:
+            name: Place name
+            locations: Mapping of place name to {"lat", "lon"}; defaults to
+                       the engine's own locations
+
+        Returns:
+            tuple: (city name, distance in km), or (None, inf) without cities
+        """
+        locations = self.locations if locations is None else locations
+        place = locations[name]
+        index = self._location_index.get(name)
+        if index is not None and place is self.locations[name]:
+            city = int(self.location_nearest_city[index])
+            if city < 0:
+                return None, float('inf')
+            return self.names[city], float(self.location_nearest_km[index])
+        if "nearest_city" in place:
+            return place["nearest_city"], place["nearest_km"]
+        return self.nearest_city(place["lat"], place["lon"])
+
+    def snap_candidates(self, name, locations=None, k=1):
+        """
+        The k cities closest to a named place.
+
+        Shared places use the candidates measured when the engine was
+        built (up to SNAP_CANDIDATES); anything else is looked up.
+
+        Args:
+            name: Place name
+            locations: Mapping of place name to {"lat", "lon"}; defaults to
+                       the engine's own locations
+            k: Number of cities wanted; 1 gives [snap(name)]
+
+        Returns:
+            List of (city name, distance in km), closest first
+        """
+        if k <= 1:
+            city, city_km = self.snap(name, locations)
+            return [(city, city_km)] if city is not None else []
+        place = (self.locations if locations is None else locations)[name]
+        index = self._location_index.get(name)
+        if index is not None and place is self.locations[name] and k <= self.location_candidates.shape[1]:
+            return [(self.names[i], km) for i, km in zip(self.location_candidates[index, :k].tolist(),
+                                                         self.location_candidates_km[index, :k].tolist())
+                    if i >= 0]
+        return self.nearest_cities(place["lat"], place["lon"], k)
+
+    def connecting_threshold(self, source, destination, thresholds, locations=None, candidates=1):
+        """
+        Smallest of the given thresholds whose graph connects two places.
+
+        Each place is snapped to its nearest `candidates` cities, as route()
+        does; any start city reaching any end city counts. The sparsest
+        connecting graph is also the cheapest one to search.
+
+        Args:
+            source: Starting place name
+            destination: Ending place name
+            thresholds: Candidate thresholds in kilometers (at most
+                        max_threshold_km)
+            locations: Mapping of place name to {"lat", "lon"}; defaults to
+                       the engine's own locations
+            candidates: Cities considered at each end
+
+        Returns:
+            The threshold, or None if none of them connects the places
+        """
+        src_cities = [city for city, _ in self.snap_candidates(source, locations, candidates)]
+        dst_cities = [city for city, _ in self.snap_candidates(destination, locations, candidates)]
+        # Two cities are connected exactly from their minimax edge length up
+        needed_km = min((self.sweep.minimax_km(a, b) for a in src_cities for b in dst_cities),
+                        default=float('inf'))
+        return next((t for t in sorted(thresholds) if t >= needed_km), None)
+
+    def route(self, source, destination, threshold_km, locations=None, algorithm=None, table=None,
+              candidates=1):
+        """
+        Route between two places, snapping each end to its nearest city.
+
+        Places closer than LOCAL_ROUTE_KM, or sharing a nearest city, are
+        joined directly. Otherwise the city-to-city leg is read from `table`
+        if given, else searched with `algorithm` if given, else read from
+        the shortest-path-tree cache (A* when the cache is disabled). Trees
+        and plain Dijkstra searches use the O(V²) array search instead of
+        the heap when the view's edge density favours it.
+
+        With candidates > 1 each end may snap to any of its nearest
+        `candidates` cities, and the combination with the smallest total
+        wins, so a slightly farther city on a better corridor can be used.
+        All combinations are read from `table` if given, else searched
+        pair by pair with `algorithm` if given, else read from the cached
+        trees of the start cities, else solved by one
+        multi_endpoint_search() seeded with the snap distances.
+
+        Args:
+            source: Starting place name
+            destination: Ending place name
+            threshold_km: Edge threshold in kilometers
+            locations: Mapping of place name to {"lat", "lon"}; defaults to
+                       the engine's own locations
+            algorithm: One of dijkstra.ROUTING_ALGORITHMS to search with
+                       instead of reading the tree cache, or None
+            table: Optional DistanceTable for this threshold; ignored
+                   unless table_matches() accepts it
+            candidates: Cities considered at each end
+
+        Returns:
+            tuple: (path, straight-line km, mode) with mode "local",
+                   "intercity", or "direct" when no city route exists
+        """
+        locations = self.locations if locations is None else locations
+        src_coords, dst_coords = locations[source], locations[destination]
+        direct = calculate_distance_km(src_coords["lat"], src_coords["lon"], dst_coords["lat"], dst_coords["lon"])
+
+        if direct < LOCAL_ROUTE_KM:
+            return [source, destination], round(direct, 2), "local"
+
+        src_city, src_dist = self.snap(source, locations)
+        dst_city, dst_dist = self.snap(destination, locations)
+
+        if src_city == dst_city:
+            return [source, destination], round(direct, 2), "local"
+
+        graph = self.graph_for(threshold_km)
+        if table is not None and not self.table_matches(table, threshold_km):
+            table = None
+        if candidates > 1:
+            return self._route_candidates(source, destination, direct, graph, locations, algorithm, table,
+                                          candidates)
+        if not graph.connected(src_city, dst_city):
+            # Different components: no search can find a route
+            return [source, destination], round(direct, 2), "direct"
+        try:
+            if table is not None:
+                # Precomputed all-pairs table: O(1) lookup plus path unrolling
+                city_path, city_dist = table.route(src_city, dst_city)
+            elif algorithm is None and self.path_trees is not None:
+                # One full tree per FROM city; further destinations are read
+                # from its predecessor array without searching again
+                search = dense_shortest_path_tree if prefers_dense_search(graph) else shortest_path_tree
+                city_path, city_dist = self.path_trees.route(graph, src_city, dst_city, search=search)
+            else:
+                city_path, city_dist = self._search(graph, src_city, dst_city, algorithm)
+        except (ValueError, KeyError):
+            city_path = None
+
+        if city_path:
+            return _place_path(source, destination, city_path), round(src_dist + city_dist + dst_dist, 2), "intercity"
+        return [source, destination], round(direct, 2), "direct"
+
+    def _search(self, graph, source, destination, algorithm):
+        # One point-to-point search between cities; A* unless told otherwise
+        algorithm = algorithm or "astar"
+        if algorithm == "dijkstra" and prefers_dense_search(graph):
+            return dijkstra_dense(graph, source, destination)
+        return find_shortest_path(graph, source, destination, algorithm, self.node_coords)
+
+    def _route_candidates(self, source, destination, direct, graph, locations, algorithm, table, candidates):
+        # Intercity leg of route() over the k nearest cities at both ends
+        src_options = dict(self.snap_candidates(source, locations, candidates))
+        dst_options = dict(self.snap_candidates(destination, locations, candidates))
+        labels, ids = graph.components, graph.ids
+        src_labels = {int(labels[ids[city]]) for city in src_options}
+        if not any(int(labels[ids[city]]) in src_labels for city in dst_options):
+            # No start city shares a component with any end city
+            return [source, destination], round(direct, 2), "direct"
+
+        try:
+            if table is not None:
+                # k² O(1) lookups are cheaper than any search
+                total, src_city, dst_city = min(
+                    (src_km + table.distance(a, b) + dst_km, a, b)
+                    for a, src_km in src_options.items() for b, dst_km in dst_options.items()
+                )
+                city_path = table.route(src_city, dst_city)[0] if total < float('inf') else None
+            elif algorithm is not None:
+                # The requested search, once per connected combination
+                city_path, total = None, float('inf')
+                for a, src_km in src_options.items():
+                    for b, dst_km in dst_options.items():
+                        if labels[ids[a]] != labels[ids[b]]:
+                            continue
+                        path, dist = self._search(graph, a, b, algorithm)
+                        if path and src_km + dist + dst_km < total:
+                            city_path, total = path, src_km + dist + dst_km
+            elif self.path_trees is not None:
+                # One cached tree per start city answers all its end cities;
+                # start cities in no end city's component are skipped
+                search = dense_shortest_path_tree if prefers_dense_search(graph) else shortest_path_tree
+                dst_labels = {int(labels[ids[city]]) for city in dst_options}
+                totals = []
+                for a, src_km in src_options.items():
+                    if int(labels[ids[a]]) in dst_labels:
+                        distances = self.path_trees.tree(graph, a, search=search)[0]
+                        totals.extend((src_km + float(distances[ids[b]]) + dst_km, a, b)
+                                      for b, dst_km in dst_options.items())
+                total, src_city, dst_city = min(totals)
+                city_path = (self.path_trees.route(graph, src_city, dst_city, search=search)[0]
+                             if total < float('inf') else None)
+            else:
+                city_path, total = multi_endpoint_search(graph, src_options, dst_options)
+        except (ValueError, KeyError):
+            city_path = None
+
+        if city_path:
+            return _place_path(source, destination, city_path), round(total, 2), "intercity"
+        return [source, destination], round(direct, 2), "direct"
+
+
+# Main execution for testing: compare per-rerun cost against st.cache_data
+if __name__ == "__main__":
+    import pickle
+    import time
+    import tracemalloc
+
+    from locations_data import get_all_locations
+
+    SESSIONS = 20
+    THRESHOLD = 300
+
+    def build_cached_values():
+        # The values the app used to keep in st.cache_data
+        cities = load_cities("pak_cities.csv")
+        all_locations = {city["name"]: {"lat": city["lat"], "lon": city["lon"], "type": "city"}
+                         for city in cities}
+        for name, coords in get_all_locations().items():
+            if name not in all_locations:
+                all_locations[name] = {"lat": coords[0], "lon": coords[1], "type": "area"}
+        graph = build_csr_graph(cities, threshold_km=THRESHOLD)
+        return cities, all_locations, graph
+
+    # st.cache_data stores pickled bytes and unpickles them on every call
+    stored = [pickle.dumps(value) for value in build_cached_values()]
+
+    def rerun_with_cache_data():
+        return [pickle.loads(blob) for blob in stored]
+
+    engine = RoutingEngine.from_csv("pak_cities.csv", extra_locations=get_all_locations())
+
+    def rerun_with_engine():
+        return engine.cities, engine.locations, engine.graph_for(THRESHOLD)
+
+    for label, rerun in (("st.cache_data copies", rerun_with_cache_data),
+                         ("shared RoutingEngine", rerun_with_engine)):
+        rerun()
+        started = time.perf_counter()
+        for _ in range(200):
+            rerun()
+        latency_ms = (time.perf_counter() - started) / 200 * 1000
+
+        # Memory held when SESSIONS concurrent reruns each keep their values
+        tracemalloc.start()
+        held = [rerun() for _ in range(SESSIONS)]
+        memory_kib = tracemalloc.get_traced_memory()[0] / 1024
+        tracemalloc.stop()
+        del held
+
+        print(f"{label:22s}: {latency_ms:8.3f} ms per rerun, "
+              f"{memory_kib:8.0f} KiB for {SESSIONS} concurrent sessions")
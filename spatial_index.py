@@ -0,0 +1,264 @@
+"""
+Spatial Index for City Coordinates
+Buckets cities into a uniform grid so neighbour, nearest-city and radius
+searches only look at nearby cells instead of comparing every city.
+"""
+
+import numpy as np
+
+
+# Earth's radius in kilometers (same value used by the Haversine formula)
+EARTH_RADIUS_KM = 6371
+
+# The 27 cell offsets that make up a cell's neighbourhood (itself included)
+NEIGHBOUR_OFFSETS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+    dtype=np.int64
+)
+
+
+def to_cartesian_km(lats, lons):
+    """
+    Convert latitude/longitude to 3D points on a sphere of Earth's radius.
+
+    Working in 3D avoids the longitude squeeze near the poles and the
+    wrap-around at the antimeridian that a plain lat/lon grid suffers from.
+
+    Args:
+        lats, lons: Latitudes and longitudes in degrees
+
+    Returns:
+        NumPy array of shape (n, 3) with x, y, z in kilometers
+    """
+    lat_rad = np.radians(np.asarray(lats, dtype=float))
+    lon_rad = np.radians(np.asarray(lons, dtype=float))
+    cos_lat = np.cos(lat_rad)
+    return EARTH_RADIUS_KM * np.column_stack((
+        cos_lat * np.cos(lon_rad),
+        cos_lat * np.sin(lon_rad),
+        np.sin(lat_rad)
+    ))
+
+
+def typical_spacing_km(lats, lons):
+    """
+    Rough distance between neighbouring cities: the side of the square each
+    city would get if they were spread evenly over their bounding box.
+
+    Args:
+        lats, lons: Arrays of city coordinates in degrees
+
+    Returns:
+        Spacing in kilometers (at least 1)
+    """
+    lats, lons = np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)
+    if len(lats) < 2:
+        return 1.0
+    km_per_degree = np.pi * EARTH_RADIUS_KM / 180
+    height = np.ptp(lats) * km_per_degree
+    width = np.ptp(lons) * km_per_degree * np.cos(np.radians(lats.mean()))
+    return max(float(np.sqrt(max(height, 1.0) * max(width, 1.0) / len(lats))), 1.0)
+
+
+class CityGrid:
+    """
+    Uniform 3D grid over city coordinates.
+
+    The straight-line (chord) distance between two points on the sphere is
+    never longer than their great-circle distance, so any two cities within
+    `cell_km` along the surface always fall into the same or adjacent cells.
+    Looking at the 27 surrounding cells therefore gives a superset of the
+    true neighbours, which callers then filter with the exact Haversine.
+
+    The same grid answers queries for arbitrary points: nearest() grows a
+    cube of cells around the point until the k closest cities are settled,
+    and within() returns candidates for a radius search.
+    """
+
+    def __init__(self, lats, lons, cell_km):
+        """
+        Args:
+            lats, lons: Arrays of city coordinates in degrees
+            cell_km: Edge length of each grid cell in kilometers
+        """
+        # Guard against zero/negative thresholds producing empty cells
+        self.cell_km = max(float(cell_km), 1.0)
+        self.points = to_cartesian_km(lats, lons)
+        self.size = len(self.points)
+
+        # Integer cell coordinates, shifted so every component starts at 0
+        cells = np.floor(self.points / self.cell_km).astype(np.int64)
+        if self.size:
+            self._origin = cells.min(axis=0) - 1
+            self._shape = cells.max(axis=0) - self._origin + 2
+        else:
+            self._origin = np.zeros(3, dtype=np.int64)
+            self._shape = np.ones(3, dtype=np.int64)
+        self._cells = cells - self._origin
+
+        # Sort cities by flattened cell key so each cell is a contiguous run
+        keys = self._flatten(self._cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def _flatten(self, cells):
+        return (cells[..., 0] * self._shape[1] + cells[..., 1]) * self._shape[2] + cells[..., 2]
+
+    def _cell_runs(self, cells):
+        # Start/end positions in the sorted order of the cities in each cell
+        keys = self._flatten(cells)
+        start = np.searchsorted(self._sorted_keys, keys, side="left")
+        end = np.searchsorted(self._sorted_keys, keys, side="right")
+        return start, end
+
+    def nearby(self, index):
+        """
+        Get candidate neighbours of a city from its own and adjacent cells.
+
+        Args:
+            index: Position of the city in the original cities list
+
+        Returns:
+            Sorted NumPy array of city indices (including `index` itself)
+        """
+        start, end = self._cell_runs(self._cells[index] + NEIGHBOUR_OFFSETS)
+        runs = [self._order[s:e] for s, e in zip(start.tolist(), end.tolist())]
+        return np.sort(np.concatenate(runs))
+
+    def candidate_pairs(self):
+        """
+        Every pair of cities that share or touch a grid cell.
+
+        Runs fully vectorized: for each of the 27 cell offsets the matching
+        runs of the sorted key array are expanded in one go.
+
+        Returns:
+            tuple: (i, j) index arrays with i < j, in no particular order
+        """
+        all_i, all_j = [], []
+        for offset in NEIGHBOUR_OFFSETS:
+            start, end = self._cell_runs(self._cells + offset)
+            counts = end - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # Expand each city's run [start, end) into explicit pairs
+            i = np.repeat(np.arange(self.size), counts)
+            run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = self._order[np.repeat(start, counts) + run_offsets]
+
+            keep = j > i
+            all_i.append(i[keep])
+            all_j.append(j[keep])
+
+        if not all_i:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        return np.concatenate(all_i), np.concatenate(all_j)
+
+    def _cube(self, cell, rings):
+        # Cities in every cell at most `rings` cells away from `cell` along
+        # each axis; the cube is clipped to the grid so keys never alias
+        low = np.maximum(cell - rings, 0)
+        high = np.minimum(cell + rings, self._shape - 1)
+        if np.any(low > high):
+            return np.zeros(0, dtype=np.int64)
+        axes = [np.arange(a, b + 1) for a, b in zip(low.tolist(), high.tolist())]
+        cells = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        start, end = self._cell_runs(cells)
+        counts = end - start
+        run_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self._order[np.repeat(start, counts) + run_offsets]
+
+    def _locate(self, lat, lon):
+        point = to_cartesian_km([lat], [lon])[0]
+        return point, np.floor(point / self.cell_km).astype(np.int64) - self._origin
+
+    def nearest(self, lat, lon, k=1):
+        """
+        The k cities closest to a point along the surface.
+
+        Great-circle distance grows with chord length, so cities are ranked
+        by chord. A cube reaching `rings` cells out holds every city within
+        rings * cell_km, so once the cube has k candidates, widening it to
+        the k-th candidate's chord is guaranteed to contain the true k
+        closest. That bounds a query to a few cube lookups.
+
+        Args:
+            lat, lon: Query point in degrees
+            k: Number of cities wanted
+
+        Returns:
+            NumPy array of up to k city indices, closest first
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        point, cell = self._locate(lat, lon)
+        # Rings after which the cube covers the whole grid from this cell
+        last_ring = int(np.max(np.maximum(cell, self._shape - 1 - cell)))
+
+        rings = 1
+        candidates = self._cube(cell, rings)
+        while len(candidates) < k:
+            rings = min(rings * 2, last_ring)
+            candidates = self._cube(cell, rings)
+        chords = np.linalg.norm(self.points[candidates] - point, axis=1)
+        closest = np.argsort(chords, kind="stable")[:k]
+
+        needed = min(int(np.ceil(chords[closest[-1]] / self.cell_km)), last_ring)
+        if needed > rings:
+            candidates = self._cube(cell, needed)
+            chords = np.linalg.norm(self.points[candidates] - point, axis=1)
+            closest = np.argsort(chords, kind="stable")[:k]
+        return candidates[closest]
+
+    def within(self, lat, lon, radius_km):
+        """
+        Candidate cities within radius_km of a point.
+
+        A superset of the true answer, like nearby(); callers filter with
+        the exact Haversine distance.
+
+        Args:
+            lat, lon: Query point in degrees
+            radius_km: Search radius in kilometers
+
+        Returns:
+            NumPy array of city indices, in no particular order
+        """
+        if not self.size or radius_km < 0:
+            return np.zeros(0, dtype=np.int64)
+        _, cell = self._locate(lat, lon)
+        return self._cube(cell, int(np.ceil(radius_km / self.cell_km)))
+
+
+# Main execution for testing: grid nearest-city lookups against a full scan
+if __name__ == "__main__":
+    import random
+    import time
+
+    from dijkstra import load_cities, city_coordinate_arrays, haversine_km
+
+    random.seed(4)
+    points = [(random.uniform(24, 37), random.uniform(61, 75)) for _ in range(300)]
+    rng = np.random.default_rng(4)
+    datasets = [("Pakistan", *city_coordinate_arrays(load_cities("pak_cities.csv")))]
+    datasets += [(f"Synthetic {n:,}", rng.uniform(24, 37, n), rng.uniform(61, 75, n)) for n in (3000, 100000)]
+
+    for label, lats, lons in datasets:
+        grid = CityGrid(lats, lons, 2 * typical_spacing_km(lats, lons))
+
+        started = time.perf_counter()
+        found = [grid.nearest(lat, lon, 3) for lat, lon in points]
+        grid_us = (time.perf_counter() - started) / len(points) * 1e6
+
+        started = time.perf_counter()
+        expected = [np.argsort(haversine_km(lat, lon, lats, lons), kind="stable")[:3] for lat, lon in points]
+        scan_us = (time.perf_counter() - started) / len(points) * 1e6
+
+        same = sum(np.array_equal(a, b) for a, b in zip(found, expected))
+        print(f"{label:18s} {len(lats):7d} cities: grid {grid_us:7.0f} µs, full scan {scan_us:7.0f} µs "
+              f"per 3-nearest query, identical {same}/{len(points)}")